@@ -1,19 +1,88 @@
-from random import randint
-from datetime import datetime
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from datetime import date as calendar_date, datetime, timedelta
+from functools import lru_cache
+
+# Largest number of pending date index pairs inserted one by one instead of merged.
+_INSORT_LIMIT = 256
+
+
+def _parse_date(date: str) -> int:
+    """Parse a YYYY-MM-DD date into a proleptic Gregorian ordinal, raising ValueError if invalid."""
+    return datetime.strptime(date, "%Y-%m-%d").toordinal()
+
+
+@lru_cache(maxsize=4096)
+def _cached_ordinal(date: str):
+    """Return the date ordinal or None if the date is invalid; statements repeat the same few dates."""
+    try:
+        return _parse_date(date)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _month_of(ordinal: int) -> str:
+    """Return the YYYY-MM month of a date ordinal."""
+    day = calendar_date.fromordinal(ordinal)
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def _months(start_month: str, end_month: str) -> list:
+    """Return the YYYY-MM months from start_month to end_month inclusive."""
+    start = datetime.strptime(start_month, "%Y-%m")
+    end = datetime.strptime(end_month, "%Y-%m")
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _month_bounds(month: str) -> tuple:
+    """Return the first and last YYYY-MM-DD date of a YYYY-MM month."""
+    first = datetime.strptime(month, "%Y-%m").date()
+    following = first.replace(year=first.year + 1, month=1) if first.month == 12 else first.replace(month=first.month + 1)
+    return first.isoformat(), (following - timedelta(days=1)).isoformat()
 
 
 class Entry:
     """Represents a single budget transaction."""
 
-    def __init__(self, entry_id: int, date: str, amount: float, category: str, description: str, entry_type: str):
+    def __init__(self, entry_id: int, date: str, amount: float, category: str, description: str, entry_type: str,
+                 ordinal: int = None):
         """Initialize entry with ID, date, amount, category, description, and type."""
         self.entry_id = entry_id
         self.date = date
+        self._ordinal = ordinal
         self.amount = amount
         self.category = category
         self.description = description
         self.entry_type = entry_type
 
+    @property
+    def ordinal(self) -> int:
+        """Return the date as a proleptic Gregorian ordinal, parsing it on first use."""
+        if self._ordinal is None:
+            self._ordinal = _parse_date(self.date)
+        return self._ordinal
+
+
+def _heap_extend(heap: list, items: list):
+    """Push items onto a heap, re-heapifying when the batch is large compared to the heap."""
+    if len(items) * 8 < len(heap):
+        for item in items:
+            heapq.heappush(heap, item)
+    else:
+        heap.extend(items)
+        heapq.heapify(heap)
+
+
+def _net_total(entries) -> float:
+    """Return incomes minus expenses for a list of entries."""
+    return sum(e.amount if e.entry_type == "tulu" else -e.amount for e in entries)
+
 
 class Budget:
     """Manages budget entries and provides financial analysis."""
@@ -22,57 +91,230 @@ class Budget:
         """Initialize budget with name and minimum transaction amount."""
         self.name = name
         self.min_amount = min_amount
-        self.entries = []
+        # Entries keyed by ID; dicts keep insertion order for get_all_entries.
+        self._by_id = {}
+        self._next_id = 1000
+
+        # Running aggregates, updated on every add and remove.
+        self._by_type = {"kulu": {}, "tulu": {}}
+        self._sums = {"kulu": 0.0, "tulu": 0.0}
+        self._category_totals = {}
+        self._category_counts = {}
+        # Category -> min-heap of entry IDs, so ties list categories by their oldest live entry.
+        self._category_firsts = {}
+        self._count_buckets = {}
+        self._max_count = 0
+        # Heaps use lazy deletion: removed entries are skipped when they reach the top.
+        self._min_heaps = {"kulu": [], "tulu": []}
+        self._max_heaps = {"kulu": [], "tulu": []}
+        # Sorted (date ordinal, entry ID) pairs for date range queries. New pairs wait in _date_pending
+        # until the next range query, and pairs of removed entries stay until the index is compacted.
+        self._date_index = []
+        self._date_pending = []
+        # Rollups: month -> (category, entry type) -> [amount sum, entry count].
+        self._rollups = {}
+
+    @property
+    def entries(self) -> list:
+        """Return all entries as a list in insertion order, like get_all_entries."""
+        return self.get_all_entries()
 
     def generate_id(self) -> int:
         """Generates a unique ID"""
-        while True:
-            new_id = randint(1000, 99999)
-            if not any(entry.entry_id == new_id for entry in self.entries):
-                return new_id
+        new_id = self._next_id
+        self._next_id += 1
+        return new_id
 
     def can_add_entry(self, amount: float, category: str, description: str, entry_type: str, date: str) -> bool:
         """Validate if entry data meets budget requirements."""
+        return self._validate(amount, category, entry_type, date) is not None
+
+    def _validate(self, amount: float, category: str, entry_type: str, date: str):
+        """Return the date ordinal if entry data is valid, otherwise None."""
         if not isinstance(amount, (int, float)) or amount < self.min_amount or amount <= 0:
-            return False
+            return None
         if entry_type not in ["kulu", "tulu"]:
-            return False
+            return None
         if not category:
-            return False
-
-        try:
-            datetime.strptime(date, "%Y-%m-%d")
-        except ValueError:
-            return False
+            return None
 
-        return True
+        return _cached_ordinal(date)
 
     def add_entry(self, amount: float, category: str, description: str, entry_type: str, date: str):
         """Add a new entry if validation passes."""
-        if self.can_add_entry(amount, category, description, entry_type, date):
-            new_entry = Entry(self.generate_id(), date, amount, category, description, entry_type)
-            self.entries.append(new_entry)
+        ordinal = self._validate(amount, category, entry_type, date)
+        if ordinal is not None:
+            new_entry = Entry(self.generate_id(), date, amount, category, description, entry_type, ordinal)
+            self._by_id[new_entry.entry_id] = new_entry
+            self._track_entry(new_entry)
+
+    def add_entries(self, rows) -> list:
+        """
+        Add many entries in one pass.
+
+        Rows are (amount, category, description, entry_type, date) tuples, validated like add_entry.
+        Returns the new entry ID for every accepted row and None for every rejected row.
+        The whole batch is built before anything is stored, so a malformed row leaves the budget unchanged.
+        """
+        results = []
+        new_entries = []
+        next_id = self._next_id
+        for amount, category, description, entry_type, date in rows:
+            ordinal = self._validate(amount, category, entry_type, date)
+            if ordinal is None:
+                results.append(None)
+                continue
+            new_entries.append(Entry(next_id, date, amount, category, description, entry_type, ordinal))
+            results.append(next_id)
+            next_id += 1
+
+        self._next_id = next_id
+        self._by_id.update((e.entry_id, e) for e in new_entries)
+        self._track_entries(new_entries)
+        return results
 
     def can_remove_entry(self, entry_id: int) -> bool:
         """Check if an entry ID exists in the budget."""
-        return any(entry.entry_id == entry_id for entry in self.entries)
+        return entry_id in self._by_id
 
     def remove_entry(self, entry_id: int):
         """Remove entry by ID if present."""
         if self.can_remove_entry(entry_id):
-            self.entries = [e for e in self.entries if e.entry_id != entry_id]
+            self._untrack_entry(self._by_id.pop(entry_id))
+
+    def _track_entry(self, entry: Entry):
+        """Add an entry to the running aggregates."""
+        self._track_entries([entry])
+
+    def _track_entries(self, entries: list):
+        """Add a batch of entries to the running aggregates."""
+        new_heap_items = {"kulu": [], "tulu": []}
+        # Per-category (added count, net value) of this batch, applied once per category below.
+        batch_categories = {}
+        batch_ids = {}
+        for entry in entries:
+            self._by_type[entry.entry_type][entry.entry_id] = entry
+            self._sums[entry.entry_type] += entry.amount
+            new_heap_items[entry.entry_type].append((entry.amount, entry.entry_id))
+
+            cell = self._rollups.setdefault(_month_of(entry.ordinal), {}).setdefault(
+                (entry.category, entry.entry_type), [0.0, 0])
+            cell[0] += entry.amount
+            cell[1] += 1
+
+            value = entry.amount if entry.entry_type == "tulu" else -entry.amount
+            added, net = batch_categories.get(entry.category, (0, 0.0))
+            batch_categories[entry.category] = (added + 1, net + value)
+            batch_ids.setdefault(entry.category, []).append(entry.entry_id)
+
+        for category, (added, net) in batch_categories.items():
+            count = self._category_counts.get(category, 0)
+            if count == 0:
+                self._category_totals[category] = 0.0
+            self._category_totals[category] += net
+            self._move_category_count(category, count, count + added)
+        for category, entry_ids in batch_ids.items():
+            _heap_extend(self._category_firsts.setdefault(category, []), entry_ids)
+
+        for entry_type, items in new_heap_items.items():
+            _heap_extend(self._min_heaps[entry_type], items)
+            _heap_extend(self._max_heaps[entry_type], [(-amount, entry_id) for amount, entry_id in items])
+
+        self._date_pending.extend((e.ordinal, e.entry_id) for e in entries)
+
+    def _untrack_entry(self, entry: Entry):
+        """Remove an entry from the running aggregates."""
+        same_type = self._by_type[entry.entry_type]
+        del same_type[entry.entry_id]
+        # Reset instead of subtracting so float error does not linger in an empty total.
+        self._sums[entry.entry_type] = self._sums[entry.entry_type] - entry.amount if same_type else 0.0
+        if len(self._min_heaps[entry.entry_type]) > 2 * len(same_type) + 16:
+            self._rebuild_heaps(entry.entry_type)
+        if len(self._date_index) > 2 * len(self._by_id) + 1024:
+            self._date_index = [pair for pair in self._date_index if pair[1] in self._by_id]
+        if len(self._date_pending) > 2 * len(self._by_id) + 1024:
+            self._date_pending = [pair for pair in self._date_pending if pair[1] in self._by_id]
+
+        month = _month_of(entry.ordinal)
+        cells = self._rollups[month]
+        cell = cells[(entry.category, entry.entry_type)]
+        if cell[1] == 1:
+            del cells[(entry.category, entry.entry_type)]
+            if not cells:
+                del self._rollups[month]
+        else:
+            cell[0] -= entry.amount
+            cell[1] -= 1
+
+        category = entry.category
+        count = self._category_counts[category]
+        if count == 1:
+            del self._category_totals[category]
+            del self._category_firsts[category]
+        else:
+            value = entry.amount if entry.entry_type == "tulu" else -entry.amount
+            self._category_totals[category] -= value
+            firsts = self._category_firsts[category]
+            if len(firsts) > 2 * count + 16:
+                firsts[:] = [entry_id for entry_id in firsts if entry_id in self._by_id]
+                heapq.heapify(firsts)
+        self._move_category_count(category, count, count - 1)
+
+    def _move_category_count(self, category: str, old_count: int, new_count: int):
+        """Move a category between count buckets and keep the highest count up to date."""
+        if old_count:
+            bucket = self._count_buckets[old_count]
+            del bucket[category]
+            if not bucket:
+                del self._count_buckets[old_count]
+        if new_count:
+            self._category_counts[category] = new_count
+            self._count_buckets.setdefault(new_count, {})[category] = None
+        else:
+            del self._category_counts[category]
+
+        if new_count > self._max_count:
+            self._max_count = new_count
+        elif old_count == self._max_count and old_count not in self._count_buckets:
+            self._max_count = new_count
+
+    def _rebuild_heaps(self, entry_type: str):
+        """Drop removed entries from the heaps of one entry type."""
+        live = self._by_type[entry_type].values()
+        self._min_heaps[entry_type] = [(e.amount, e.entry_id) for e in live]
+        self._max_heaps[entry_type] = [(-e.amount, e.entry_id) for e in live]
+        heapq.heapify(self._min_heaps[entry_type])
+        heapq.heapify(self._max_heaps[entry_type])
+
+    def _heap_top(self, heap: list, entry_type: str):
+        """Return the live entry on top of a heap, skipping removed ones."""
+        live = self._by_type[entry_type]
+        while heap and heap[0][1] not in live:
+            heapq.heappop(heap)
+        return live[heap[0][1]] if heap else None
+
+    def _category_first(self, category: str) -> int:
+        """Return the ID of the oldest live entry in a category, skipping removed ones."""
+        firsts = self._category_firsts[category]
+        while firsts[0] not in self._by_id:
+            heapq.heappop(firsts)
+        return firsts[0]
+
+    def get_entry(self, entry_id: int):
+        """Return the entry with the given ID or None."""
+        return self._by_id.get(entry_id)
 
     def get_all_entries(self):
-        """Return all entries."""
-        return self.entries
+        """Return all entries in insertion order."""
+        return list(self._by_id.values())
 
     def get_expenses(self):
         """Return only expense entries."""
-        return [e for e in self.entries if e.entry_type == "kulu"]
+        return list(self._by_type["kulu"].values())
 
     def get_incomes(self):
         """Return only income entries."""
-        return [e for e in self.entries if e.entry_type == "tulu"]
+        return list(self._by_type["tulu"].values())
 
     def get_expenses_by_amount_desc(self):
         """Return expenses sorted by amount descending."""
@@ -84,66 +326,134 @@ class Budget:
 
     def get_average_expense(self):
         """Return average expense amount or 0.0."""
-        expenses = self.get_expenses()
-        if not expenses:
+        count = len(self._by_type["kulu"])
+        if not count:
             return 0.0
-        return sum(e.amount for e in expenses) / len(expenses)
+        return self._sums["kulu"] / count
 
     def get_average_income(self):
         """Return average income amount or 0.0."""
-        incomes = self.get_incomes()
-        if not incomes:
+        count = len(self._by_type["tulu"])
+        if not count:
             return 0.0
-        return sum(e.amount for e in incomes) / len(incomes)
+        return self._sums["tulu"] / count
 
     def get_biggest_expense(self):
         """Return the highest expense entry."""
-        return max(self.get_expenses(), key=lambda e: e.amount, default=None)
+        return self._heap_top(self._max_heaps["kulu"], "kulu")
 
     def get_smallest_expense(self):
         """Return the lowest expense entry."""
-        return min(self.get_expenses(), key=lambda e: e.amount, default=None)
+        return self._heap_top(self._min_heaps["kulu"], "kulu")
 
     def get_biggest_income(self):
         """Return the highest income entry."""
-        return max(self.get_incomes(), key=lambda e: e.amount, default=None)
+        return self._heap_top(self._max_heaps["tulu"], "tulu")
 
     def get_smallest_income(self):
         """Return the lowest income entry."""
-        return min(self.get_incomes(), key=lambda e: e.amount, default=None)
+        return self._heap_top(self._min_heaps["tulu"], "tulu")
 
     def get_total(self):
         """Calculate net balance (incomes - expenses)."""
-        return sum(e.amount if e.entry_type == "tulu" else -e.amount for e in self.entries)
+        return self._sums["tulu"] - self._sums["kulu"]
 
-    def get_total_recursive(self, entries_list=None):
-        """Calculate net balance using recursion."""
+    def get_total_recursive(self, entries_list=None, start: int = 0, end: int = None):
+        """Calculate net balance using recursion, halving the range so the depth stays O(log n)."""
         if entries_list is None:
-            entries_list = self.entries
-
-        if not entries_list:
-            return 0.0
-
-        current = entries_list[0]
-        value = current.amount if current.entry_type == "tulu" else -current.amount
-        return value + self.get_total_recursive(entries_list[1:])
+            entries_list = self.get_all_entries()
+        if end is None:
+            end = len(entries_list)
+
+        if end - start <= 1:
+            if start == end:
+                return 0.0
+            current = entries_list[start]
+            return float(current.amount if current.entry_type == "tulu" else -current.amount)
+
+        middle = (start + end) // 2
+        return self.get_total_recursive(entries_list, start, middle) + self.get_total_recursive(entries_list, middle, end)
+
+    def get_total_chunked(self, chunk_size: int = 10000, executor=None):
+        """Calculate net balance chunk by chunk, optionally fanning chunks out to a concurrent.futures executor."""
+        entries = self.get_all_entries()
+        chunks = [entries[i:i + chunk_size] for i in range(0, len(entries), chunk_size)]
+        if executor is None:
+            return sum(map(_net_total, chunks), 0.0)
+        return sum(executor.map(_net_total, chunks), 0.0)
 
     def get_summary_by_category(self):
         """Return a dictionary of net totals per category."""
-        summary = {}
-        for e in self.entries:
-            value = e.amount if e.entry_type == "tulu" else -e.amount
-            summary[e.category] = summary.get(e.category, 0.0) + value
-        return summary
+        return dict(self._category_totals)
 
     def get_most_common_category(self):
         """Return a list of the most frequent categories."""
-        if not self.entries:
+        if not self._max_count:
             return []
 
-        counts = {}
-        for e in self.entries:
-            counts[e.category] = counts.get(e.category, 0) + 1
+        return sorted(self._count_buckets[self._max_count], key=self._category_first)
+
+    def _sorted_dates(self):
+        """Merge pending pairs into the date index and return it."""
+        pending = [pair for pair in self._date_pending if pair[1] in self._by_id]
+        self._date_pending = []
+        if len(pending) <= _INSORT_LIMIT:
+            # One insort only moves pointers, about 2000 times cheaper than merging the whole index.
+            for pair in pending:
+                insort(self._date_index, pair)
+        else:
+            # Two sorted runs, so the sort is a linear merge.
+            self._date_index += sorted(pending)
+            self._date_index.sort()
+        return self._date_index
+
+    def get_entries_between(self, start_date: str, end_date: str):
+        """Return entries dated from start_date to end_date inclusive, ordered by date."""
+        date_index = self._sorted_dates()
+        low = bisect_left(date_index, (_parse_date(start_date),))
+        high = bisect_right(date_index, (_parse_date(end_date), float("inf")))
+        return [self._by_id[entry_id] for _, entry_id in date_index[low:high] if entry_id in self._by_id]
+
+    def get_total_between(self, start_date: str, end_date: str):
+        """Calculate net balance of entries dated from start_date to end_date inclusive."""
+        return _net_total(self.get_entries_between(start_date, end_date))
+
+    def get_summary_by_category_between(self, start_date: str, end_date: str):
+        """Return a dictionary of net totals per category for entries from start_date to end_date inclusive."""
+        summary = {}
+        for e in self.get_entries_between(start_date, end_date):
+            value = e.amount if e.entry_type == "tulu" else -e.amount
+            summary[e.category] = summary.get(e.category, 0.0) + value
+        return summary
+
+    def _month_summary(self, month: str):
+        """Return a dictionary of net totals per category for one YYYY-MM month."""
+        summary = {}
+        for (category, entry_type), (amount, _) in self._rollups.get(month, {}).items():
+            summary[category] = summary.get(category, 0.0) + (amount if entry_type == "tulu" else -amount)
+        return summary
 
-        max_count = max(counts.values())
-        return [c for c, count in counts.items() if count == max_count]
\ No newline at end of file
+    def _month_net(self, month: str, category: str = None):
+        """Return the net total of one month, optionally for a single category."""
+        summary = self._month_summary(month)
+        if category is None:
+            return sum(summary.values(), 0.0)
+        return summary.get(category, 0.0)
+
+    def get_monthly_totals(self, start_month: str, end_month: str, category: str = None):
+        """Return net totals per YYYY-MM month from start_month to end_month, optionally for one category."""
+        return {month: self._month_net(month, category) for month in _months(start_month, end_month)}
+
+    def get_monthly_summary_by_category(self, start_month: str, end_month: str):
+        """Return per-category net totals for every YYYY-MM month from start_month to end_month."""
+        return {month: self._month_summary(month) for month in _months(start_month, end_month)}
+
+    def get_month_over_month(self, month: str, category: str = None):
+        """Return the change in net total from the previous month to the given YYYY-MM month."""
+        first_day, _ = _month_bounds(month)
+        previous = _month_of(_parse_date(first_day) - 1)
+        return self._month_net(month, category) - self._month_net(previous, category)
+
+    def get_year_to_date(self, month: str, category: str = None):
+        """Return the net total from January up to and including the given YYYY-MM month."""
+        return sum(self.get_monthly_totals(month[:4] + "-01", month, category).values(), 0.0)
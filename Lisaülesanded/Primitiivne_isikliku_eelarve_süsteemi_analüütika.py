@@ -0,0 +1,261 @@
+from Primitiivne_isikliku_eelarve_süsteem import Budget, Entry, _month_bounds, _parse_date
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_TYPE_CODES = {"kulu": 0, "tulu": 1}
+_TYPE_NAMES = ["kulu", "tulu"]
+
+
+class ColumnarBudget(Budget):
+    """Budget that keeps entries in NumPy columns and builds Entry objects only when they are returned."""
+
+    def __init__(self, name: str, min_amount: float, capacity: int = 1024):
+        """Initialize budget with name, minimum transaction amount and initial column capacity."""
+        if np is None:
+            raise ImportError("ColumnarBudget needs NumPy")
+        self.name = name
+        self.min_amount = min_amount
+        self._next_id = 1000
+        self._size = 0
+        self._live = 0
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._amounts = np.zeros(capacity, dtype=np.float64)
+        self._types = np.zeros(capacity, dtype=np.int8)
+        self._categories = np.zeros(capacity, dtype=np.int32)
+        self._ordinals = np.zeros(capacity, dtype=np.int32)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._dates = []
+        self._descriptions = []
+        self._rows = {}
+        self._category_codes = {}
+        self._category_names = []
+
+    def _grow(self, needed: int):
+        """Make room for at least needed rows, doubling the column capacity."""
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity)
+        for column in ("_ids", "_amounts", "_types", "_categories", "_ordinals", "_alive"):
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, column, new)
+
+    def _compact(self):
+        """Drop removed rows from the columns."""
+        keep = np.flatnonzero(self._alive[:self._size])
+        for column in ("_ids", "_amounts", "_types", "_categories", "_ordinals", "_alive"):
+            values = getattr(self, column)
+            values[:len(keep)] = values[keep]
+            values[len(keep):self._size] = 0
+        self._dates = [self._dates[row] for row in keep]
+        self._descriptions = [self._descriptions[row] for row in keep]
+        self._size = len(keep)
+        self._rows = {int(entry_id): row for row, entry_id in enumerate(self._ids[:self._size])}
+
+    def _category_code(self, category: str) -> int:
+        """Return the code of a category, assigning a new one on first use."""
+        code = self._category_codes.get(category)
+        if code is None:
+            code = self._category_codes[category] = len(self._category_names)
+            self._category_names.append(category)
+        return code
+
+    def _entry(self, row: int) -> Entry:
+        """Build the Entry object for a row."""
+        return Entry(int(self._ids[row]), self._dates[row], float(self._amounts[row]),
+                     self._category_names[self._categories[row]], self._descriptions[row],
+                     _TYPE_NAMES[self._types[row]], int(self._ordinals[row]))
+
+    def _entries(self, rows) -> list:
+        """Build Entry objects for rows in the given order."""
+        return [self._entry(row) for row in rows]
+
+    def _live_rows(self, entry_type: str = None):
+        """Return the row numbers of live entries, optionally of one type, in insertion order."""
+        mask = self._alive[:self._size]
+        if entry_type is not None:
+            mask = mask & (self._types[:self._size] == _TYPE_CODES[entry_type])
+        return np.flatnonzero(mask)
+
+    def _signed_amounts(self, rows):
+        """Return amounts of the rows with expenses negated."""
+        return np.where(self._types[rows] == _TYPE_CODES["tulu"], self._amounts[rows], -self._amounts[rows])
+
+    def add_entry(self, amount: float, category: str, description: str, entry_type: str, date: str):
+        """Add a new entry if validation passes."""
+        self.add_entries([(amount, category, description, entry_type, date)])
+
+    def add_entries(self, rows) -> list:
+        """
+        Add many entries in one pass.
+
+        Returns the new entry ID for every accepted row and None for every rejected row.
+        Rows are validated before the columns are written, so a malformed row leaves the budget unchanged.
+        """
+        results = []
+        staged = []
+        for amount, category, description, entry_type, date in rows:
+            ordinal = self._validate(amount, category, entry_type, date)
+            if ordinal is None:
+                results.append(None)
+                continue
+            results.append(self._next_id + len(staged))
+            staged.append((amount, category, description, entry_type, date, ordinal))
+        if not staged:
+            return results
+
+        amounts, categories, descriptions, entry_types, dates, ordinals = zip(*staged)
+        start, end = self._size, self._size + len(staged)
+        first_id = self._next_id
+        self._grow(end)
+        self._ids[start:end] = range(first_id, first_id + len(staged))
+        self._amounts[start:end] = amounts
+        self._types[start:end] = [_TYPE_CODES[entry_type] for entry_type in entry_types]
+        self._categories[start:end] = [self._category_code(category) for category in categories]
+        self._ordinals[start:end] = ordinals
+        self._alive[start:end] = True
+        self._dates.extend(dates)
+        self._descriptions.extend(descriptions)
+        self._rows.update(zip(range(first_id, first_id + len(staged)), range(start, end)))
+        self._next_id += len(staged)
+        self._live += len(staged)
+        self._size = end
+        return results
+
+    def can_remove_entry(self, entry_id: int) -> bool:
+        """Check if an entry ID exists in the budget."""
+        return entry_id in self._rows
+
+    def remove_entry(self, entry_id: int):
+        """Remove entry by ID if present."""
+        if self.can_remove_entry(entry_id):
+            self._alive[self._rows.pop(entry_id)] = False
+            self._live -= 1
+            if self._size > 2 * self._live + 1024:
+                self._compact()
+
+    def get_entry(self, entry_id: int):
+        """Return the entry with the given ID or None."""
+        row = self._rows.get(entry_id)
+        return None if row is None else self._entry(row)
+
+    def get_all_entries(self):
+        """Return all entries in insertion order."""
+        return self._entries(self._live_rows())
+
+    def get_expenses(self):
+        """Return only expense entries."""
+        return self._entries(self._live_rows("kulu"))
+
+    def get_incomes(self):
+        """Return only income entries."""
+        return self._entries(self._live_rows("tulu"))
+
+    def _by_amount_desc(self, entry_type: str):
+        """Return rows of one type sorted by amount descending, keeping insertion order for ties."""
+        rows = self._live_rows(entry_type)
+        return rows[np.argsort(-self._amounts[rows], kind="stable")]
+
+    def get_expenses_by_amount_desc(self):
+        """Return expenses sorted by amount descending."""
+        return self._entries(self._by_amount_desc("kulu"))
+
+    def get_incomes_by_amount_desc(self):
+        """Return incomes sorted by amount descending."""
+        return self._entries(self._by_amount_desc("tulu"))
+
+    def _average(self, entry_type: str):
+        """Return the average amount of one type or 0.0."""
+        rows = self._live_rows(entry_type)
+        if not len(rows):
+            return 0.0
+        return float(self._amounts[rows].mean())
+
+    def get_average_expense(self):
+        """Return average expense amount or 0.0."""
+        return self._average("kulu")
+
+    def get_average_income(self):
+        """Return average income amount or 0.0."""
+        return self._average("tulu")
+
+    def _extreme(self, entry_type: str, biggest: bool):
+        """Return the first entry with the highest or lowest amount of one type, or None."""
+        rows = self._live_rows(entry_type)
+        if not len(rows):
+            return None
+        amounts = self._amounts[rows]
+        return self._entry(rows[amounts.argmax() if biggest else amounts.argmin()])
+
+    def get_biggest_expense(self):
+        """Return the highest expense entry."""
+        return self._extreme("kulu", True)
+
+    def get_smallest_expense(self):
+        """Return the lowest expense entry."""
+        return self._extreme("kulu", False)
+
+    def get_biggest_income(self):
+        """Return the highest income entry."""
+        return self._extreme("tulu", True)
+
+    def get_smallest_income(self):
+        """Return the lowest income entry."""
+        return self._extreme("tulu", False)
+
+    def get_total(self):
+        """Calculate net balance (incomes - expenses)."""
+        return float(self._signed_amounts(self._live_rows()).sum())
+
+    def _summary(self, rows):
+        """Return net totals per category for the rows, in category code order."""
+        codes = self._categories[rows]
+        length = len(self._category_names)
+        totals = np.bincount(codes, weights=self._signed_amounts(rows), minlength=length)
+        counts = np.bincount(codes, minlength=length)
+        return {self._category_names[code]: float(totals[code]) for code in np.flatnonzero(counts)}
+
+    def get_summary_by_category(self):
+        """Return a dictionary of net totals per category."""
+        return self._summary(self._live_rows())
+
+    def get_most_common_category(self):
+        """Return a list of the most frequent categories."""
+        rows = self._live_rows()
+        if not len(rows):
+            return []
+
+        codes = self._categories[rows]
+        counts = np.bincount(codes, minlength=len(self._category_names))
+        # Ties are listed by the first live row of each category, like Budget does.
+        common, first_rows = np.unique(codes, return_index=True)
+        tied = counts[common] == counts.max()
+        return [self._category_names[code] for code in common[tied][np.argsort(first_rows[tied])]]
+
+    def _rows_between(self, start_date: str, end_date: str):
+        """Return live rows dated from start_date to end_date inclusive, ordered by date."""
+        rows = self._live_rows()
+        ordinals = self._ordinals[rows]
+        rows = rows[(ordinals >= _parse_date(start_date)) & (ordinals <= _parse_date(end_date))]
+        return rows[np.argsort(self._ordinals[rows], kind="stable")]
+
+    def get_entries_between(self, start_date: str, end_date: str):
+        """Return entries dated from start_date to end_date inclusive, ordered by date."""
+        return self._entries(self._rows_between(start_date, end_date))
+
+    def get_total_between(self, start_date: str, end_date: str):
+        """Calculate net balance of entries dated from start_date to end_date inclusive."""
+        return float(self._signed_amounts(self._rows_between(start_date, end_date)).sum())
+
+    def get_summary_by_category_between(self, start_date: str, end_date: str):
+        """Return a dictionary of net totals per category for entries from start_date to end_date inclusive."""
+        return self._summary(self._rows_between(start_date, end_date))
+
+    def _month_summary(self, month: str):
+        """Return a dictionary of net totals per category for one YYYY-MM month."""
+        return self.get_summary_by_category_between(*_month_bounds(month))
@@ -0,0 +1,183 @@
+import sqlite3
+
+from Primitiivne_isikliku_eelarve_süsteem import Budget, Entry, _month_bounds, _parse_date
+
+_SIGNED_AMOUNT = "CASE WHEN entry_type = 'tulu' THEN amount ELSE -amount END"
+_ENTRY_COLUMNS = "entry_id, date, amount, category, description, entry_type, ordinal"
+
+
+class SQLiteBudget(Budget):
+    """Budget stored in an SQLite database, with aggregates computed in SQL."""
+
+    def __init__(self, name: str, min_amount: float, path: str = ":memory:"):
+        """Open or create the budget database at path and continue ID allocation where it stopped."""
+        self.name = name
+        self.min_amount = min_amount
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "entry_id INTEGER PRIMARY KEY, date TEXT NOT NULL, amount REAL NOT NULL, category TEXT NOT NULL, "
+                "description TEXT, entry_type TEXT NOT NULL, ordinal INTEGER NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS entries_ordinal ON entries (ordinal, entry_id)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS entries_category ON entries (category)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS entries_type_amount ON entries (entry_type, amount)")
+            # The ID counter is stored so IDs of removed entries are not handed out again after reopening.
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS budget_meta ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), next_id INTEGER NOT NULL)"
+            )
+        last_id = self._scalar("SELECT MAX(entry_id) FROM entries")
+        stored_next_id = self._scalar("SELECT MAX(next_id) FROM budget_meta")
+        self._next_id = max(1000, 0 if last_id is None else last_id + 1, stored_next_id or 0)
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def _select(self, where: str = "", params: tuple = (), order: str = "entry_id"):
+        """Return entries matching a WHERE clause in the given order."""
+        sql = f"SELECT {_ENTRY_COLUMNS} FROM entries {where} ORDER BY {order}"
+        return [Entry(*row) for row in self.connection.execute(sql, params)]
+
+    def _scalar(self, sql: str, params: tuple = ()):
+        """Return the single value of a query."""
+        return self.connection.execute(sql, params).fetchone()[0]
+
+    def add_entry(self, amount: float, category: str, description: str, entry_type: str, date: str):
+        """Add a new entry if validation passes."""
+        self.add_entries([(amount, category, description, entry_type, date)])
+
+    def add_entries(self, rows) -> list:
+        """
+        Add many entries in one transaction.
+
+        Returns the new entry ID for every accepted row and None for every rejected row.
+        All rows are validated before any ID is allocated, so a malformed row leaves the budget unchanged.
+        """
+        results = []
+        new_rows = []
+        next_id = self._next_id
+        for amount, category, description, entry_type, date in rows:
+            ordinal = self._validate(amount, category, entry_type, date)
+            if ordinal is None:
+                results.append(None)
+                continue
+            new_rows.append((next_id, date, amount, category, description, entry_type, ordinal))
+            results.append(next_id)
+            next_id += 1
+
+        with self.connection:
+            self.connection.executemany(f"INSERT INTO entries ({_ENTRY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", new_rows)
+            self.connection.execute("INSERT OR REPLACE INTO budget_meta (id, next_id) VALUES (1, ?)", (next_id,))
+        self._next_id = next_id
+        return results
+
+    def can_remove_entry(self, entry_id: int) -> bool:
+        """Check if an entry ID exists in the budget."""
+        return self._scalar("SELECT EXISTS(SELECT 1 FROM entries WHERE entry_id = ?)", (entry_id,)) == 1
+
+    def remove_entry(self, entry_id: int):
+        """Remove entry by ID if present."""
+        with self.connection:
+            self.connection.execute("DELETE FROM entries WHERE entry_id = ?", (entry_id,))
+
+    def get_entry(self, entry_id: int):
+        """Return the entry with the given ID or None."""
+        entries = self._select("WHERE entry_id = ?", (entry_id,))
+        return entries[0] if entries else None
+
+    def get_all_entries(self):
+        """Return all entries in insertion order."""
+        return self._select()
+
+    def get_expenses(self):
+        """Return only expense entries."""
+        return self._select("WHERE entry_type = 'kulu'")
+
+    def get_incomes(self):
+        """Return only income entries."""
+        return self._select("WHERE entry_type = 'tulu'")
+
+    def get_expenses_by_amount_desc(self):
+        """Return expenses sorted by amount descending."""
+        return self._select("WHERE entry_type = 'kulu'", order="amount DESC, entry_id")
+
+    def get_incomes_by_amount_desc(self):
+        """Return incomes sorted by amount descending."""
+        return self._select("WHERE entry_type = 'tulu'", order="amount DESC, entry_id")
+
+    def get_average_expense(self):
+        """Return average expense amount or 0.0."""
+        return self._scalar("SELECT COALESCE(AVG(amount), 0.0) FROM entries WHERE entry_type = 'kulu'")
+
+    def get_average_income(self):
+        """Return average income amount or 0.0."""
+        return self._scalar("SELECT COALESCE(AVG(amount), 0.0) FROM entries WHERE entry_type = 'tulu'")
+
+    def _extreme(self, entry_type: str, order: str):
+        """Return the first entry of a type in the given amount order, or None."""
+        entries = self._select("WHERE entry_type = ?", (entry_type,), f"amount {order}, entry_id LIMIT 1")
+        return entries[0] if entries else None
+
+    def get_biggest_expense(self):
+        """Return the highest expense entry."""
+        return self._extreme("kulu", "DESC")
+
+    def get_smallest_expense(self):
+        """Return the lowest expense entry."""
+        return self._extreme("kulu", "ASC")
+
+    def get_biggest_income(self):
+        """Return the highest income entry."""
+        return self._extreme("tulu", "DESC")
+
+    def get_smallest_income(self):
+        """Return the lowest income entry."""
+        return self._extreme("tulu", "ASC")
+
+    def get_total(self):
+        """Calculate net balance (incomes - expenses)."""
+        return self._scalar(f"SELECT COALESCE(SUM({_SIGNED_AMOUNT}), 0.0) FROM entries")
+
+    def get_summary_by_category(self):
+        """Return a dictionary of net totals per category."""
+        return dict(self.connection.execute(
+            f"SELECT category, SUM({_SIGNED_AMOUNT}) FROM entries GROUP BY category ORDER BY MIN(entry_id)"
+        ))
+
+    def get_most_common_category(self):
+        """Return a list of the most frequent categories."""
+        rows = self.connection.execute(
+            "SELECT category, COUNT(*) FROM entries GROUP BY category ORDER BY MIN(entry_id)"
+        ).fetchall()
+        if not rows:
+            return []
+
+        max_count = max(count for _, count in rows)
+        return [c for c, count in rows if count == max_count]
+
+    def get_entries_between(self, start_date: str, end_date: str):
+        """Return entries dated from start_date to end_date inclusive, ordered by date."""
+        return self._select("WHERE ordinal BETWEEN ? AND ?", (_parse_date(start_date), _parse_date(end_date)),
+                            "ordinal, entry_id")
+
+    def get_total_between(self, start_date: str, end_date: str):
+        """Calculate net balance of entries dated from start_date to end_date inclusive."""
+        return self._scalar(f"SELECT COALESCE(SUM({_SIGNED_AMOUNT}), 0.0) FROM entries WHERE ordinal BETWEEN ? AND ?",
+                            (_parse_date(start_date), _parse_date(end_date)))
+
+    def get_summary_by_category_between(self, start_date: str, end_date: str):
+        """Return a dictionary of net totals per category for entries from start_date to end_date inclusive."""
+        return dict(self.connection.execute(
+            f"SELECT category, SUM({_SIGNED_AMOUNT}) FROM entries WHERE ordinal BETWEEN ? AND ? "
+            "GROUP BY category ORDER BY MIN(ordinal), MIN(entry_id)",
+            (_parse_date(start_date), _parse_date(end_date)),
+        ))
+
+    def _month_summary(self, month: str):
+        """Return a dictionary of net totals per category for one YYYY-MM month."""
+        return self.get_summary_by_category_between(*_month_bounds(month))
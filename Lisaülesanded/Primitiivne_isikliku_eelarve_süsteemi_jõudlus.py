@@ -0,0 +1,146 @@
+"""
+Scaling benchmarks for the budget system.
+
+Every operation is timed at N = 10^3 ... 10^5 entries (set BUDGET_BENCHMARK_MAX_EXPONENT=6 to go up to 10^6) and
+the growth exponent of its per-call time is checked: about 0 for constant-time operations, about 1 for operations
+that walk every entry. A quadratic regression, like the old random ID generation, adds 1 to the exponent and fails.
+Run the file directly to print the time and memory curves.
+"""
+import math
+import os
+import timeit
+import tracemalloc
+
+import pytest
+from Primitiivne_isikliku_eelarve_süsteem import Budget
+
+SIZES = [10 ** exponent for exponent in range(3, int(os.environ.get("BUDGET_BENCHMARK_MAX_EXPONENT", "5")) + 1)]
+
+# Highest allowed growth exponent of the per-call time.
+CONSTANT = 0.5
+LINEAR = 1.5
+
+GETTERS = {
+    "get_all_entries": LINEAR,
+    "get_expenses": LINEAR,
+    "get_incomes": LINEAR,
+    "get_expenses_by_amount_desc": LINEAR,
+    "get_incomes_by_amount_desc": LINEAR,
+    "get_average_expense": CONSTANT,
+    "get_average_income": CONSTANT,
+    "get_biggest_expense": CONSTANT,
+    "get_smallest_expense": CONSTANT,
+    "get_biggest_income": CONSTANT,
+    "get_smallest_income": CONSTANT,
+    "get_total": CONSTANT,
+    "get_total_recursive": LINEAR,
+    "get_summary_by_category": CONSTANT,
+    "get_most_common_category": CONSTANT,
+}
+
+
+def make_rows(n: int) -> list:
+    """Return n valid entry rows spread over a year and 30 categories."""
+    return [(1.0 + i % 500, f"C{i % 30}", "Item", "kulu" if i % 3 else "tulu", f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+            for i in range(n)]
+
+
+def make_budget(n: int) -> Budget:
+    """Return a budget holding n entries."""
+    budget = Budget("Benchmark", 1.0)
+    budget.add_entries(make_rows(n))
+    return budget
+
+
+def seconds_per_call(function) -> float:
+    """Return the best per-call time of a function over a few automatically sized runs."""
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < 0.01:
+        number *= 10
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def seconds_per_add(n: int) -> float:
+    """Return the average time of one add_entry call while filling an empty budget with n entries."""
+    rows = make_rows(n)
+    budget = Budget("Benchmark", 1.0)
+    start = timeit.default_timer()
+    for row in rows:
+        budget.add_entry(*row)
+    return (timeit.default_timer() - start) / n
+
+
+def seconds_per_remove(n: int) -> float:
+    """Return the average time of one remove_entry call while emptying a budget of n entries."""
+    budget = make_budget(n)
+    entry_ids = [e.entry_id for e in budget.get_all_entries()]
+    start = timeit.default_timer()
+    for entry_id in entry_ids:
+        budget.remove_entry(entry_id)
+    return (timeit.default_timer() - start) / n
+
+
+def bytes_per_entry(n: int) -> float:
+    """Return the traced memory of a budget of n entries divided by n."""
+    tracemalloc.start()
+    budget = make_budget(n)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del budget
+    return size / n
+
+
+def growth_exponent(curve: dict) -> float:
+    """Return the exponent k for which the value grows like N^k between the smallest and largest N."""
+    sizes = sorted(curve)
+    first, last = sizes[0], sizes[-1]
+    return math.log(curve[last] / curve[first]) / math.log(last / first)
+
+
+def measure_getters(sizes=SIZES) -> dict:
+    """Return per-call time curves {getter: {N: seconds}} for every getter."""
+    curves = {name: {} for name in GETTERS}
+    for n in sizes:
+        budget = make_budget(n)
+        for name in GETTERS:
+            curves[name][n] = seconds_per_call(getattr(budget, name))
+    return curves
+
+
+@pytest.mark.timeout(120.0)
+def test_add_entry_is_constant_time():
+    """Adding an entry must take about the same time whatever the budget size."""
+    assert growth_exponent({n: seconds_per_add(n) for n in SIZES}) < CONSTANT
+
+
+@pytest.mark.timeout(120.0)
+def test_remove_entry_is_constant_time():
+    """Removing an entry must take about the same time whatever the budget size."""
+    assert growth_exponent({n: seconds_per_remove(n) for n in SIZES}) < CONSTANT
+
+
+@pytest.mark.timeout(120.0)
+def test_getters_scale():
+    """Report getters must stay constant time or linear in the number of entries."""
+    curves = measure_getters()
+    slow = {name: growth_exponent(curve) for name, curve in curves.items() if growth_exponent(curve) >= GETTERS[name]}
+    assert slow == {}
+
+
+@pytest.mark.timeout(120.0)
+def test_memory_per_entry_stays_flat():
+    """Memory must grow linearly with the number of entries."""
+    assert growth_exponent({n: bytes_per_entry(n) for n in SIZES}) < CONSTANT
+
+
+if __name__ == '__main__':
+    def report(name: str, curve: dict, unit: str, scale: float):
+        values = "  ".join(f"N={n:<8} {curve[n] * scale:10.2f} {unit}" for n in sorted(curve))
+        print(f"{name:32} {values}  growth N^{growth_exponent(curve):.2f}")
+
+    report("add_entry", {n: seconds_per_add(n) for n in SIZES}, "us", 1e6)
+    report("remove_entry", {n: seconds_per_remove(n) for n in SIZES}, "us", 1e6)
+    for getter, getter_curve in measure_getters().items():
+        report(getter, getter_curve, "us", 1e6)
+    report("memory per entry", {n: bytes_per_entry(n) for n in SIZES}, "B", 1)
@@ -0,0 +1,134 @@
+import json
+import os
+
+from Primitiivne_isikliku_eelarve_süsteem import Budget, Entry
+
+
+class JournaledBudget(Budget):
+    """
+    Budget that appends every change to a journal file and rebuilds itself from it on startup.
+
+    Journal lines are ["a", id, date, amount, category, description, type] for added entries and ["r", id]
+    for removed ones. The journal is fsynced every sync_every records and folded into a snapshot file
+    every compact_every records, so a crash loses at most the records written since the last sync.
+    """
+
+    def __init__(self, name: str, min_amount: float, path: str, sync_every: int = 100, compact_every: int = 100000):
+        """Initialize budget and replay the snapshot and journal stored at path."""
+        super().__init__(name, min_amount)
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self.sync_every = sync_every
+        self.compact_every = compact_every
+        self._unsynced = 0
+        self._records = 0
+        self._replay()
+        self._journal = open(self.path, "a", encoding="utf-8")
+
+    def _restore(self, entry_id: int, date: str, amount: float, category: str, description: str, entry_type: str):
+        """Put a stored entry back without journaling it again."""
+        if entry_id in self._by_id:
+            return
+        entry = Entry(entry_id, date, amount, category, description, entry_type)
+        self._by_id[entry_id] = entry
+        self._track_entry(entry)
+        self._next_id = max(self._next_id, entry_id + 1)
+
+    def _replay(self):
+        """Load the snapshot, then apply the journal records written after it."""
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as file:
+                snapshot = json.load(file)
+            for row in snapshot["entries"]:
+                self._restore(*row)
+            self._next_id = max(self._next_id, snapshot["next_id"])
+
+        if not os.path.exists(self.path):
+            return
+        intact = 0
+        with open(self.path, "rb") as file:
+            for line in file:
+                try:
+                    record = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    record = None
+                if record is None:
+                    # A torn last line from a crash mid-write; everything before it is intact.
+                    break
+                if record[0] == "a":
+                    self._restore(*record[1:])
+                else:
+                    Budget.remove_entry(self, record[1])
+                self._records += 1
+                intact += len(line)
+        if intact < os.path.getsize(self.path):
+            os.truncate(self.path, intact)
+
+    def _write(self, record: list):
+        """Append one record to the journal, syncing every sync_every records."""
+        self._journal.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._unsynced += 1
+        self._records += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        """Flush buffered journal records to disk."""
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._unsynced = 0
+
+    def add_entry(self, amount: float, category: str, description: str, entry_type: str, date: str):
+        """Add a new entry if validation passes."""
+        self.add_entries([(amount, category, description, entry_type, date)])
+
+    def add_entries(self, rows) -> list:
+        """
+        Add many entries in one pass and journal the accepted ones.
+
+        Returns the new entry ID for every accepted row and None for every rejected row.
+        """
+        results = super().add_entries(rows)
+        for entry_id in results:
+            if entry_id is not None:
+                e = self._by_id[entry_id]
+                self._write(["a", e.entry_id, e.date, e.amount, e.category, e.description, e.entry_type])
+        self._maybe_compact()
+        return results
+
+    def remove_entry(self, entry_id: int):
+        """Remove entry by ID if present and journal the removal."""
+        if self.can_remove_entry(entry_id):
+            super().remove_entry(entry_id)
+            self._write(["r", entry_id])
+            self._maybe_compact()
+
+    def _maybe_compact(self):
+        """Compact the journal once it holds compact_every records."""
+        if self._records >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Write all entries to a new snapshot and empty the journal."""
+        temporary_path = self.snapshot_path + ".tmp"
+        snapshot = {
+            "next_id": self._next_id,
+            "entries": [[e.entry_id, e.date, e.amount, e.category, e.description, e.entry_type]
+                        for e in self._by_id.values()],
+        }
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, separators=(",", ":"))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.snapshot_path)
+
+        # Replaying records already in the snapshot is harmless, so a crash before this point loses nothing.
+        self._journal.close()
+        self._journal = open(self.path, "w", encoding="utf-8")
+        self.sync()
+        self._records = 0
+
+    def close(self):
+        """Sync and close the journal."""
+        self.sync()
+        self._journal.close()
@@ -0,0 +1,194 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from Primitiivne_isikliku_eelarve_süsteem import Budget
+
+
+class ReadWriteLock:
+    """Lock that lets many readers in at once and gives writers exclusive access; both sides are reentrant."""
+
+    def __init__(self):
+        """Initialize an unlocked lock."""
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def reading(self):
+        """Hold the lock for reading; waiting writers go first so they are not starved."""
+        depth = getattr(self._local, "depth", 0)
+        if depth or self._writer == threading.get_ident():
+            # Nested read, or a writer reading its own state: it already has access.
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def writing(self):
+        """Hold the lock exclusively."""
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth += 1
+            else:
+                self._waiting_writers += 1
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+                self._waiting_writers -= 1
+                self._writer = me
+                self._writer_depth = 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+def _reading(method):
+    """Wrap a Budget method so it runs under the read lock."""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock.reading():
+            return method(self, *args, **kwargs)
+    return locked
+
+
+def _writing(method):
+    """Wrap a Budget method so it runs under the write lock."""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock.writing():
+            return method(self, *args, **kwargs)
+    return locked
+
+
+class ThreadSafeBudget(Budget):
+    """Budget that can be shared by writer and reader threads."""
+
+    def __init__(self, name: str, min_amount: float):
+        """Initialize budget with name, minimum transaction amount and its locks."""
+        super().__init__(name, min_amount)
+        self._lock = ReadWriteLock()
+        # Readers tidy the lazy heaps and the date index, so those get their own lock.
+        self._index_lock = threading.Lock()
+
+    generate_id = _writing(Budget.generate_id)
+    add_entry = _writing(Budget.add_entry)
+    add_entries = _writing(Budget.add_entries)
+    remove_entry = _writing(Budget.remove_entry)
+
+    can_remove_entry = _reading(Budget.can_remove_entry)
+    get_entry = _reading(Budget.get_entry)
+    get_all_entries = _reading(Budget.get_all_entries)
+    get_expenses = _reading(Budget.get_expenses)
+    get_incomes = _reading(Budget.get_incomes)
+    get_expenses_by_amount_desc = _reading(Budget.get_expenses_by_amount_desc)
+    get_incomes_by_amount_desc = _reading(Budget.get_incomes_by_amount_desc)
+    get_average_expense = _reading(Budget.get_average_expense)
+    get_average_income = _reading(Budget.get_average_income)
+    get_biggest_expense = _reading(Budget.get_biggest_expense)
+    get_smallest_expense = _reading(Budget.get_smallest_expense)
+    get_biggest_income = _reading(Budget.get_biggest_income)
+    get_smallest_income = _reading(Budget.get_smallest_income)
+    get_total = _reading(Budget.get_total)
+    get_summary_by_category = _reading(Budget.get_summary_by_category)
+    get_most_common_category = _reading(Budget.get_most_common_category)
+    get_entries_between = _reading(Budget.get_entries_between)
+    get_total_between = _reading(Budget.get_total_between)
+    get_summary_by_category_between = _reading(Budget.get_summary_by_category_between)
+    get_monthly_totals = _reading(Budget.get_monthly_totals)
+    get_monthly_summary_by_category = _reading(Budget.get_monthly_summary_by_category)
+    get_month_over_month = _reading(Budget.get_month_over_month)
+    get_year_to_date = _reading(Budget.get_year_to_date)
+
+    def _heap_top(self, heap: list, entry_type: str):
+        """Return the live entry on top of a heap, skipping removed ones."""
+        with self._index_lock:
+            return super()._heap_top(heap, entry_type)
+
+    def _category_first(self, category: str) -> int:
+        """Return the ID of the oldest live entry in a category, skipping removed ones."""
+        with self._index_lock:
+            return super()._category_first(category)
+
+    def _sorted_dates(self):
+        """Merge pending pairs into the date index and return it."""
+        with self._index_lock:
+            return super()._sorted_dates()
+
+    def get_total_recursive(self, entries_list=None, start: int = 0, end: int = None):
+        """Calculate net balance using recursion over a snapshot of the entries."""
+        if entries_list is None:
+            entries_list = self.get_all_entries()
+        return super().get_total_recursive(entries_list, start, end)
+
+
+def benchmark_read_throughput(thread_counts=(1, 2, 4, 8), duration: float = 1.0, entries: int = 10000) -> dict:
+    """
+    Measure report reads per second for several reader thread counts while one writer keeps adding and removing.
+
+    :param thread_counts: numbers of reader threads to try
+    :param duration: seconds to run each measurement
+    :param entries: number of entries in the budget before the measurement starts
+    :return: dictionary of reader thread count to reads per second
+    """
+    results = {}
+    for thread_count in thread_counts:
+        budget = ThreadSafeBudget("Benchmark", 1.0)
+        budget.add_entries([(1.0 + i % 100, f"C{i % 30}", "", "kulu" if i % 3 else "tulu", "2025-02-13")
+                            for i in range(entries)])
+        stop = threading.Event()
+        reads = [0] * thread_count
+
+        def write():
+            while not stop.is_set():
+                budget.add_entry(5.0, "Food", "", "kulu", "2025-02-14")
+                budget.remove_entry(budget._next_id - 1)
+
+        def read(slot: int):
+            while not stop.is_set():
+                budget.get_total()
+                budget.get_summary_by_category()
+                budget.get_biggest_expense()
+                reads[slot] += 1
+
+        threads = [threading.Thread(target=write)] + [threading.Thread(target=read, args=(i,))
+                                                      for i in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        results[thread_count] = sum(reads) / duration
+    return results
+
+
+if __name__ == '__main__':
+    for readers, throughput in benchmark_read_throughput().items():
+        print(f"{readers} readers: {throughput:.0f} reads/s")
@@ -1,5 +1,13 @@
+import datetime
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 from Primitiivne_isikliku_eelarve_süsteem import Budget, Entry
+from Primitiivne_isikliku_eelarve_süsteemi_andmebaas import SQLiteBudget
+from Primitiivne_isikliku_eelarve_süsteemi_logi import JournaledBudget
+from Primitiivne_isikliku_eelarve_süsteemi_lõimed import ThreadSafeBudget
 
 @pytest.mark.timeout(1.0)
 def test_can_add_entry_validation():
@@ -110,4 +118,359 @@ def test_total_and_recursion():
     # 100 - 30 - 20 = 50
     expected_total = 50.0
     assert b.get_total() == expected_total
-    assert b.get_total_recursive() == expected_total
\ No newline at end of file
+    assert b.get_total_recursive() == expected_total
+@pytest.mark.timeout(1.0)
+def test_ids_unique_and_order_kept_after_removal():
+    """Ensure many entries get unique IDs and removing one keeps the others in insertion order."""
+    b = Budget("Test Budget", 1.0)
+    for i in range(5000):
+        b.add_entry(10.0 + i, "Food", "Item", "kulu", "2025-02-13")
+    entries = b.get_all_entries()
+    assert len({e.entry_id for e in entries}) == 5000
+
+    removed = entries[1].entry_id
+    b.remove_entry(removed)
+    assert b.get_entry(removed) is None
+    assert b.get_entry(entries[2].entry_id) is entries[2]
+    assert [e.amount for e in b.get_all_entries()[:3]] == [10.0, 12.0, 13.0]
+
+@pytest.mark.timeout(1.0)
+def test_entries_attribute_is_a_list_of_entries():
+    """Make sure budget.entries still holds Entry objects in insertion order for every kind of budget."""
+    for b in (Budget("Test Budget", 1.0), SQLiteBudget("Test Budget", 1.0)):
+        b.add_entry(10.0, "Food", "Cheap", "kulu", "2025-02-13")
+        b.add_entry(20.0, "Rent", "Home", "kulu", "2025-02-01")
+        b.remove_entry(b.get_all_entries()[0].entry_id)
+        b.add_entry(30.0, "Salary", "Job", "tulu", "2025-02-28")
+        assert [e.amount for e in b.entries] == [20.0, 30.0]
+        assert len(b.entries) == 2 and b.entries[-1].category == "Salary"
+
+@pytest.mark.timeout(1.0)
+def test_running_aggregates_match_full_scan():
+    """Check that the incremental report values agree with a full pass over the entries after adds and removes."""
+    rng = random.Random(7)
+    b = Budget("Test Budget", 1.0)
+    for step in range(2000):
+        entries = b.get_all_entries()
+        if entries and rng.random() < 0.3:
+            b.remove_entry(rng.choice(entries).entry_id)
+        else:
+            b.add_entry(rng.randint(1, 50) * 1.0, rng.choice("ABCD"), "x", rng.choice(["kulu", "tulu"]), "2025-02-13")
+
+        if step % 50:
+            continue
+        entries = b.get_all_entries()
+        expenses = [e for e in entries if e.entry_type == "kulu"]
+        incomes = [e for e in entries if e.entry_type == "tulu"]
+        summary = {}
+        counts = {}
+        for e in entries:
+            summary[e.category] = summary.get(e.category, 0.0) + (e.amount if e.entry_type == "tulu" else -e.amount)
+            counts[e.category] = counts.get(e.category, 0) + 1
+
+        assert b.get_total() == pytest.approx(sum(e.amount for e in incomes) - sum(e.amount for e in expenses))
+        assert b.get_summary_by_category() == pytest.approx(summary)
+        assert b.get_most_common_category() == [c for c in counts if counts[c] == max(counts.values())]
+        assert b.get_biggest_expense() is max(expenses, key=lambda e: e.amount, default=None)
+        assert b.get_smallest_expense() is min(expenses, key=lambda e: e.amount, default=None)
+        assert b.get_biggest_income() is max(incomes, key=lambda e: e.amount, default=None)
+        assert b.get_smallest_income() is min(incomes, key=lambda e: e.amount, default=None)
+        if expenses:
+            assert b.get_average_expense() == pytest.approx(sum(e.amount for e in expenses) / len(expenses))
+
+@pytest.mark.timeout(1.0)
+def test_most_common_category_ties_follow_current_entries():
+    """Check that tied categories are listed in the order they first appear among the remaining entries."""
+    b = Budget("Test Budget", 1.0)
+    b.add_entry(10.0, "A", "First", "kulu", "2025-02-13")
+    b.add_entry(10.0, "B", "Second", "kulu", "2025-02-13")
+    b.add_entry(10.0, "A", "Third", "kulu", "2025-02-13")
+    assert b.get_most_common_category() == ["A"]
+
+    b.remove_entry(b.get_all_entries()[0].entry_id)
+    assert b.get_most_common_category() == ["B", "A"]
+
+@pytest.mark.timeout(1.0)
+def test_total_recursive_and_chunked_on_large_budget():
+    """Make sure the recursive and chunked totals handle ledgers far past the recursion limit."""
+    b = Budget("Test Budget", 1.0)
+    for i in range(20000):
+        b.add_entry(2.0, "Food", "Item", "tulu" if i % 4 == 0 else "kulu", "2025-02-13")
+
+    expected_total = 5000 * 2.0 - 15000 * 2.0
+    assert b.get_total_recursive() == expected_total
+    assert b.get_total_chunked(chunk_size=999) == expected_total
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert b.get_total_chunked(chunk_size=999, executor=executor) == expected_total
+
+@pytest.mark.timeout(1.0)
+def test_date_range_queries():
+    """Check that range queries only return entries inside the inclusive date range, in date order."""
+    b = Budget("Test Budget", 1.0)
+    b.add_entry(10.0, "Food", "Late", "kulu", "2025-03-01")
+    b.add_entry(20.0, "Rent", "Home", "kulu", "2025-02-01")
+    b.add_entry(100.0, "Salary", "Job", "tulu", "2025-02-28")
+    b.add_entry(5.0, "Food", "Early", "kulu", "2025-01-31")
+    b.add_entry(7.0, "Food", "Snack", "kulu", "2025-02-14")
+
+    february = b.get_entries_between("2025-02-01", "2025-02-28")
+    assert [e.amount for e in february] == [20.0, 7.0, 100.0]
+    assert b.get_total_between("2025-02-01", "2025-02-28") == 73.0
+    assert b.get_summary_by_category_between("2025-02-01", "2025-02-28") == {"Rent": -20.0, "Food": -7.0, "Salary": 100.0}
+
+    b.remove_entry(february[1].entry_id)
+    assert [e.amount for e in b.get_entries_between("2025-02-01", "2025-02-28")] == [20.0, 100.0]
+    assert b.get_entries_between("2024-01-01", "2024-12-31") == []
+
+@pytest.mark.timeout(1.0)
+def test_entry_accepts_any_date_text():
+    """Make sure an Entry can still be built with a date the budget would reject, and is parsed only when needed."""
+    e = Entry(1000, "13.02.2025", 10.0, "Food", "Item", "kulu")
+    assert e.date == "13.02.2025"
+    with pytest.raises(ValueError):
+        e.ordinal
+    assert Entry(1001, "2025-02-13", 10.0, "Food", "Item", "kulu").ordinal == Entry(
+        1002, "2025-02-12", 10.0, "Food", "Item", "kulu").ordinal + 1
+
+@pytest.mark.timeout(1.0)
+def test_date_index_does_not_grow_without_range_queries():
+    """Make sure adding and removing entries without any range query does not pile up stale date index pairs."""
+    b = Budget("Test Budget", 1.0)
+    b.add_entry(1.0, "Food", "Kept", "kulu", "2025-02-13")
+    for _ in range(20000):
+        b.add_entry(5.0, "Food", "Item", "kulu", "2025-02-14")
+        b.remove_entry(b.get_all_entries()[-1].entry_id)
+
+    assert len(b._date_pending) + len(b._date_index) < 2100
+    assert [e.description for e in b.get_entries_between("2025-02-01", "2025-02-28")] == ["Kept"]
+
+@pytest.mark.timeout(2.0)
+def test_range_query_after_single_add_on_large_budget():
+    """Make sure a range query after a single add does not re-sort a large date index."""
+    b = Budget("Test Budget", 1.0)
+    b.add_entries([(1.0 + i % 50, "Food", "Item", "kulu", f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+                   for i in range(100000)])
+    assert len(b.get_entries_between("2024-01-01", "2024-01-01")) == len(range(0, 100000, 84))
+
+    start = time.perf_counter()
+    for day in range(200):
+        date = (datetime.date(2025, 1, 1) + datetime.timedelta(days=day)).isoformat()
+        b.add_entry(7.0, "Fun", "Day", "kulu", date)
+        assert [e.description for e in b.get_entries_between(date, date)] == ["Day"]
+    # Re-sorting the whole index after every add took about 4 s here.
+    assert time.perf_counter() - start < 1.0
+
+@pytest.mark.timeout(1.0)
+def test_add_entries_bulk():
+    """Verify that bulk import accepts and rejects rows like add_entry and reports the result per row."""
+    b = Budget("Test Budget", 5.0)
+    b.add_entry(10.0, "Food", "Before", "kulu", "2025-02-13")
+    results = b.add_entries([
+        (20.0, "Rent", "Home", "kulu", "2025-02-01"),
+        (4.0, "Food", "Too cheap", "kulu", "2025-02-13"),
+        (100.0, "Salary", "Job", "tulu", "02-13-2025"),
+        (100.0, "Salary", "Job", "tulu", "2025-02-28"),
+    ])
+
+    assert results[1] is None and results[2] is None
+    assert results[0] is not None and results[3] is not None
+    assert len(set(results[0::3]) | {b.get_all_entries()[0].entry_id}) == 3
+    assert [e.amount for e in b.get_all_entries()] == [10.0, 20.0, 100.0]
+    assert b.get_total() == 70.0
+    assert b.get_biggest_expense().amount == 20.0
+    assert [e.amount for e in b.get_entries_between("2025-02-01", "2025-02-13")] == [20.0, 10.0]
+
+@pytest.mark.timeout(1.0)
+def test_add_entries_malformed_row_leaves_budget_unchanged():
+    """Check that a batch with a malformed row is rejected as a whole and does not break later adds."""
+    b = Budget("Test Budget", 1.0)
+    with pytest.raises(ValueError):
+        b.add_entries([(20.0, "Rent", "Home", "kulu", "2025-02-01"), (5.0, "Food", "kulu", "2025-02-13")])
+    with pytest.raises(TypeError):
+        b.add_entries([(20.0, "Rent", "Home", "kulu", "2025-02-01"), (5.0, "Food", "Snack", "kulu", None)])
+    assert b.get_all_entries() == []
+
+    b.add_entry(10.0, "Food", "Snack", "kulu", "2025-02-13")
+    assert [e.entry_id for e in b.get_all_entries()] == [1000]
+    assert b.get_total() == -10.0
+    assert b.get_summary_by_category() == {"Food": -10.0}
+    assert [e.amount for e in b.get_entries_between("2025-02-01", "2025-02-28")] == [10.0]
+
+@pytest.mark.timeout(1.0)
+def test_sqlite_budget_matches_memory_budget(tmp_path):
+    """Check that the SQLite budget answers like the in-memory one and keeps its entries after reopening."""
+    rows = [
+        (10.0, "Food", "Cheap", "kulu", "2025-02-13"),
+        (50.0, "Rent", "Home", "kulu", "2025-01-01"),
+        (50.0, "Food", "Party", "kulu", "2025-02-20"),
+        (300.0, "Salary", "Job", "tulu", "2025-02-01"),
+        (1.0, "Food", "Too cheap", "kulu", "2025-02-13"),
+    ]
+    memory = Budget("Test Budget", 5.0)
+    memory.add_entries(rows)
+    path = str(tmp_path / "budget.db")
+    stored = SQLiteBudget("Test Budget", 5.0, path)
+    assert stored.add_entries(rows)[-1] is None
+    stored.close()
+
+    stored = SQLiteBudget("Test Budget", 5.0, path)
+    assert [e.entry_id for e in stored.get_all_entries()] == [e.entry_id for e in memory.get_all_entries()]
+    assert stored.get_total() == memory.get_total() == 190.0
+    assert stored.get_summary_by_category() == memory.get_summary_by_category()
+    assert stored.get_most_common_category() == memory.get_most_common_category() == ["Food"]
+    assert stored.get_biggest_expense().entry_id == memory.get_biggest_expense().entry_id
+    assert stored.get_average_expense() == memory.get_average_expense()
+    assert stored.get_total_between("2025-02-01", "2025-02-28") == memory.get_total_between("2025-02-01", "2025-02-28")
+
+    stored.add_entry(20.0, "Fun", "Movie", "kulu", "2025-03-01")
+    assert stored.get_all_entries()[-1].entry_id == 1004
+    stored.remove_entry(1000)
+    assert stored.can_remove_entry(1000) is False
+    assert stored.get_smallest_expense().amount == 20.0
+    stored.close()
+
+@pytest.mark.timeout(1.0)
+def test_sqlite_budget_does_not_reuse_removed_ids(tmp_path):
+    """Check that removed IDs are never handed out again, not after reopening and not after a malformed row."""
+    path = str(tmp_path / "budget.db")
+    stored = SQLiteBudget("Test Budget", 1.0, path)
+    stored.add_entries([(10.0, "Food", "Cheap", "kulu", "2025-02-13"), (20.0, "Rent", "Home", "kulu", "2025-02-01")])
+    stored.remove_entry(1001)
+    with pytest.raises(ValueError):
+        stored.add_entries([(5.0, "Food", "Snack", "kulu", "2025-02-14"), (5.0, "Food", "kulu", "2025-02-14")])
+    stored.close()
+
+    stored = SQLiteBudget("Test Budget", 1.0, path)
+    assert [e.entry_id for e in stored.get_all_entries()] == [1000]
+    stored.add_entry(30.0, "Salary", "Job", "tulu", "2025-02-28")
+    assert [e.entry_id for e in stored.get_all_entries()] == [1000, 1002]
+    stored.close()
+
+@pytest.mark.timeout(1.0)
+def test_columnar_budget_matches_memory_budget():
+    """Check that the NumPy columnar budget gives the same reports as the in-memory one after adds and removes."""
+    pytest.importorskip("numpy")
+    from Primitiivne_isikliku_eelarve_süsteemi_analüütika import ColumnarBudget
+
+    rng = random.Random(11)
+    rows = [(rng.randint(1, 20) * 1.0, rng.choice("ABC"), "x", rng.choice(["kulu", "tulu"]),
+             f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}") for _ in range(3000)]
+    memory = Budget("Test Budget", 2.0)
+    columnar = ColumnarBudget("Test Budget", 2.0, capacity=16)
+    assert memory.add_entries(rows) == columnar.add_entries(rows)
+    for entry_id in range(1000, 3000, 3):
+        memory.remove_entry(entry_id)
+        columnar.remove_entry(entry_id)
+
+    def ids(entries):
+        return [e.entry_id for e in entries]
+
+    assert ids(columnar.get_all_entries()) == ids(memory.get_all_entries())
+    assert ids(columnar.get_expenses_by_amount_desc()) == ids(memory.get_expenses_by_amount_desc())
+    assert ids(columnar.get_incomes_by_amount_desc()) == ids(memory.get_incomes_by_amount_desc())
+    assert columnar.get_biggest_expense().entry_id == memory.get_biggest_expense().entry_id
+    assert columnar.get_smallest_income().entry_id == memory.get_smallest_income().entry_id
+    assert columnar.get_total() == pytest.approx(memory.get_total())
+    assert columnar.get_average_income() == pytest.approx(memory.get_average_income())
+    assert columnar.get_summary_by_category() == pytest.approx(memory.get_summary_by_category())
+    assert columnar.get_most_common_category() == memory.get_most_common_category()
+    assert ids(columnar.get_entries_between("2025-03-01", "2025-05-31")) == \
+        ids(memory.get_entries_between("2025-03-01", "2025-05-31"))
+    assert columnar.get_entry(1001).category == memory.get_entry(1001).category
+    assert columnar.get_entry(1000) is None
+
+    with pytest.raises(ValueError):
+        columnar.add_entries([(5.0, "A", "x", "kulu", "2025-02-13"), (5.0, "B", "kulu", "2025-02-13")])
+    assert columnar.add_entries([(5.0, "A", "y", "kulu", "2025-02-14")]) == memory.add_entries(
+        [(5.0, "A", "y", "kulu", "2025-02-14")])
+    assert columnar.get_all_entries()[-1].date == "2025-02-14"
+    assert ids(columnar.get_all_entries()) == ids(memory.get_all_entries())
+
+@pytest.mark.timeout(1.0)
+def test_journaled_budget_replays_after_restart(tmp_path):
+    """Ensure a journaled budget comes back with the same entries after a restart, a compaction and a torn write."""
+    path = str(tmp_path / "budget.journal")
+    b = JournaledBudget("Test Budget", 1.0, path, sync_every=2, compact_every=5)
+    b.add_entry(10.0, "Food", "Cheap", "kulu", "2025-02-13")
+    b.add_entries([(20.0, "Rent", "Home", "kulu", "2025-02-01"), (100.0, "Salary", "Job", "tulu", "2025-02-28")])
+    b.remove_entry(1000)
+    b.close()
+
+    b = JournaledBudget("Test Budget", 1.0, path, sync_every=2, compact_every=5)
+    assert [e.entry_id for e in b.get_all_entries()] == [1001, 1002]
+    assert b.get_total() == 80.0
+    b.add_entry(5.0, "Food", "Snack", "kulu", "2025-02-14")
+    b.add_entry(7.0, "Food", "Snack", "kulu", "2025-02-15")
+    b.remove_entry(1004)
+    b.close()
+
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('["a",1005,"2025-0')
+
+    b = JournaledBudget("Test Budget", 1.0, path)
+    assert [e.entry_id for e in b.get_all_entries()] == [1001, 1002, 1003]
+    assert b.get_summary_by_category() == {"Rent": -20.0, "Salary": 100.0, "Food": -5.0}
+    b.add_entry(1.0, "Fun", "Game", "kulu", "2025-03-01")
+    assert b.get_all_entries()[-1].entry_id == 1005
+    b.close()
+
+    b = JournaledBudget("Test Budget", 1.0, path)
+    assert [e.entry_id for e in b.get_all_entries()] == [1001, 1002, 1003, 1005]
+    b.close()
+
+@pytest.mark.timeout(1.0)
+def test_monthly_rollups():
+    """Check monthly trend, month-over-month and year-to-date values, also after removing an entry."""
+    b = Budget("Test Budget", 1.0)
+    b.add_entry(500.0, "Salary", "Job", "tulu", "2024-12-31")
+    b.add_entry(1000.0, "Salary", "Job", "tulu", "2025-01-05")
+    b.add_entry(200.0, "Food", "Groceries", "kulu", "2025-01-20")
+    b.add_entry(1000.0, "Salary", "Job", "tulu", "2025-02-05")
+    b.add_entry(300.0, "Food", "Groceries", "kulu", "2025-02-10")
+    b.add_entry(50.0, "Food", "Pizza", "kulu", "2025-3-1")
+
+    assert b.get_monthly_totals("2024-12", "2025-04") == {
+        "2024-12": 500.0, "2025-01": 800.0, "2025-02": 700.0, "2025-03": -50.0, "2025-04": 0.0}
+    assert b.get_monthly_totals("2025-01", "2025-02", "Food") == {"2025-01": -200.0, "2025-02": -300.0}
+    assert b.get_monthly_summary_by_category("2025-02", "2025-02") == {"2025-02": {"Salary": 1000.0, "Food": -300.0}}
+    assert b.get_month_over_month("2025-01") == 300.0
+    assert b.get_month_over_month("2025-02", "Food") == -100.0
+    assert b.get_year_to_date("2025-03") == 1450.0
+
+    b.remove_entry(b.get_entries_between("2025-02-10", "2025-02-10")[0].entry_id)
+    assert b.get_year_to_date("2025-03", "Food") == -250.0
+
+    stored = SQLiteBudget("Test Budget", 1.0)
+    stored.add_entries((e.amount, e.category, e.description, e.entry_type, e.date) for e in b.get_all_entries())
+    assert stored.get_monthly_totals("2024-12", "2025-04") == b.get_monthly_totals("2024-12", "2025-04")
+    stored.close()
+
+@pytest.mark.timeout(5.0)
+def test_thread_safe_budget_concurrent_writers_and_readers():
+    """Make sure concurrent writers never share an ID or lose an entry while readers run reports."""
+    b = ThreadSafeBudget("Test Budget", 1.0)
+
+    def write():
+        for _ in range(200):
+            b.add_entry(2.0, "Food", "Item", "kulu", "2025-02-13")
+            new_ids = b.add_entries([(3.0, "Salary", "Job", "tulu", "2025-02-13")])
+            b.remove_entry(new_ids[0])
+
+    def read():
+        for _ in range(200):
+            b.get_total()
+            b.get_biggest_expense()
+            b.get_year_to_date("2025-02")
+            b.get_most_common_category()
+
+    threads = [threading.Thread(target=write) for _ in range(4)] + [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    entries = b.get_all_entries()
+    assert len(entries) == 4 * 200
+    assert len({e.entry_id for e in entries}) == len(entries)
+    assert b.get_total() == pytest.approx(sum(e.amount if e.entry_type == "tulu" else -e.amount for e in entries))
+    assert b.get_total_recursive() == pytest.approx(b.get_total())
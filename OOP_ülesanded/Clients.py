@@ -1,6 +1,16 @@
 """Client."""
+import mmap
+import os
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class Client:
     """
@@ -49,6 +59,71 @@ class Client:
         return (self.current_amount - self.starting_amount) / self.account_age
 
 
+class EarningsTracker:
+    """
+    Running best and worst client of a stream of clients.
+
+    Only the client with the largest earnings per day and the client with the largest loss per day are kept,
+    with the same tie-breaking rules as largest_earnings_per_day and largest_loss_per_day.
+    """
+
+    def __init__(self):
+        """EarningsTracker constructor."""
+        self.best = None
+        self.worst = None
+        self._best_key = None
+        self._worst_key = None
+
+    def add(self, client: Client):
+        """
+        Take a client into account.
+
+        On a tie the client seen first stays, like max and min do.
+        :param client: client to compare with the current best and worst.
+        """
+        if client.current_amount > client.starting_amount:
+            key = (client.earnings_per_day(), -client.account_age)
+            if self.best is None or key > self._best_key:
+                self.best, self._best_key = client, key
+        elif client.current_amount < client.starting_amount:
+            key = (client.earnings_per_day(), client.account_age)
+            if self.worst is None or key < self._worst_key:
+                self.worst, self._worst_key = client, key
+
+
+def parse_client(line: str) -> Optional[Client]:
+    """
+    Make a client from one line of a client file.
+
+    :param line: comma separated name, bank, account age, starting amount and current amount.
+    :return: client or None for a blank line.
+    """
+    if not line.strip():
+        return None
+    parts = line.strip().split(",")
+    return Client(
+        parts[0],
+        parts[1],
+        int(parts[2]),
+        int(parts[3]),
+        int(parts[4])
+    )
+
+
+def iter_clients(filename: str):
+    """
+    Read the file one line at a time and yield client objects.
+
+    :param filename: name of file to get info from.
+    :return: generator of clients.
+    """
+    with open(filename, "r") as file:
+        for line in file:
+            client = parse_client(line)
+            if client is not None:
+                yield client
+
+
 def read_from_file_into_list(filename: str) -> list:
     """
     Read from the file, make client objects and add the clients into a list.
@@ -56,32 +131,368 @@ def read_from_file_into_list(filename: str) -> list:
     :param filename: name of file to get info from.
     :return: list of clients.
     """
-    clients = []
-    with open(filename, "r") as file:
-        for line in file:
-            if line.strip():
-                parts = line.strip().split(",")
-                clients.append(Client(
-                    parts[0],
-                    parts[1],
-                    int(parts[2]),
-                    int(parts[3]),
-                    int(parts[4])
-                ))
+    return list(iter_clients(filename))
+
+
+class ClientTable:
+    """
+    Clients stored as NumPy columns.
+
+    Earnings per day are computed for all clients at once, which is much faster than calling
+    Client.earnings_per_day for every client of a large file. Needs NumPy.
+    """
+
+    def __init__(self, names: list, banks: list, account_age, starting_amount, current_amount):
+        """
+        ClientTable constructor.
+
+        :param names: names of the clients
+        :param banks: banks of the clients
+        :param account_age: ages of the accounts in days
+        :param starting_amount: amounts of money the clients started with
+        :param current_amount: current amounts of money
+        """
+        if np is None:
+            raise ImportError("ClientTable needs NumPy")
+        self.names = list(names)
+        self.banks = list(banks)
+        self.account_age = np.asarray(account_age, dtype=np.int64)
+        self.starting_amount = np.asarray(starting_amount, dtype=np.int64)
+        self.current_amount = np.asarray(current_amount, dtype=np.int64)
+
+    @classmethod
+    def from_clients(cls, clients: list):
+        """
+        Make a table from client objects.
+
+        :param clients: list of clients.
+        :return: table of the clients.
+        """
+        return cls([c.name for c in clients], [c.bank for c in clients], [c.account_age for c in clients],
+                   [c.starting_amount for c in clients], [c.current_amount for c in clients])
+
+    @classmethod
+    def from_file(cls, filename: str, workers: Optional[int] = None):
+        """
+        Read a client file straight into a table.
+
+        :param filename: name of file to get info from.
+        :param workers: number of worker processes for read_from_file_parallel.
+        :return: table of the file's clients.
+        """
+        columns = read_from_file_parallel(filename, workers, columnar=True)
+        return cls(columns["name"], columns["bank"], columns["account_age"], columns["starting_amount"],
+                   columns["current_amount"])
+
+    def __len__(self):
+        """
+        Number of clients.
+
+        :return: number of rows in the table.
+        """
+        return len(self.names)
+
+    def client(self, row: int) -> Client:
+        """
+        Make the client object of one row.
+
+        :param row: row number.
+        :return: client.
+        """
+        return Client(self.names[row], self.banks[row], int(self.account_age[row]), int(self.starting_amount[row]),
+                      int(self.current_amount[row]))
+
+    def earnings_per_day(self):
+        """
+        Earnings per day of every client; clients with a zero-day-old account get 0 like Client.earnings_per_day.
+
+        :return: float array of earnings per day.
+        """
+        change = (self.current_amount - self.starting_amount).astype(np.float64)
+        return np.divide(change, self.account_age, out=np.zeros(len(self)), where=self.account_age != 0)
+
+    def _first_youngest(self, candidates) -> int:
+        """
+        Pick the candidate with the youngest account, the first one in the file on a tie.
+
+        :param candidates: boolean array of candidate rows.
+        :return: row number.
+        """
+        ages = np.where(candidates, self.account_age, np.iinfo(np.int64).max)
+        return int(ages.argmin())
+
+    def largest_earnings_index(self) -> Optional[int]:
+        """
+        Row of the client that has earned the most money per day, with the rules of largest_earnings_per_day.
+
+        :return: row number or None if no-one has earned money.
+        """
+        winners = self.current_amount > self.starting_amount
+        if not winners.any():
+            return None
+        earnings = self.earnings_per_day()
+        return self._first_youngest(winners & (earnings == earnings[winners].max()))
+
+    def largest_loss_index(self) -> Optional[int]:
+        """
+        Row of the client that has lost the most money per day, with the rules of largest_loss_per_day.
+
+        :return: row number or None if no-one has lost money.
+        """
+        losers = self.current_amount < self.starting_amount
+        if not losers.any():
+            return None
+        earnings = self.earnings_per_day()
+        return self._first_youngest(losers & (earnings == earnings[losers].min()))
+
+    def largest_earnings_per_day(self) -> Optional[Client]:
+        """
+        Find the client that has earned the most money per day.
+
+        :return: client with largest earnings.
+        """
+        row = self.largest_earnings_index()
+        return None if row is None else self.client(row)
+
+    def largest_loss_per_day(self) -> Optional[Client]:
+        """
+        Find the client that has lost the most money per day.
+
+        :return: client with largest loss.
+        """
+        row = self.largest_loss_index()
+        return None if row is None else self.client(row)
+
+
+def _newline_aligned_ranges(mapped, parts: int) -> list:
+    """
+    Split a mapped file into about parts byte ranges that each end just after a newline.
+
+    :param mapped: memory-mapped file contents.
+    :param parts: wanted number of ranges.
+    :return: list of (start, end) byte offsets covering the whole file in order.
+    """
+    size = len(mapped)
+    ranges = []
+    start = 0
+    for part in range(1, parts + 1):
+        if start >= size:
+            break
+        end = size if part == parts else mapped.find(b"\n", max(start, size * part // parts))
+        end = size if end == -1 else min(end + 1, size)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _parse_range(filename: str, start: int, end: int, columnar: bool):
+    """
+    Parse the clients in one byte range of a file.
+
+    :param filename: name of file to get info from.
+    :param start: first byte of the range, at the start of a line.
+    :param end: byte after the range, just after a newline or at the end of the file.
+    :param columnar: return columns instead of client objects.
+    :return: list of clients, or (names, banks, account ages, starting amounts, current amounts).
+    """
+    with open(filename, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        lines = mapped[start:end].decode().splitlines()
+
+    if not columnar:
+        return [client for client in map(parse_client, lines) if client is not None]
+
+    columns = ([], [], array("q"), array("q"), array("q"))
+    for line in lines:
+        if line.strip():
+            parts = line.strip().split(",")
+            for column, value in zip(columns, (parts[0], parts[1], int(parts[2]), int(parts[3]), int(parts[4]))):
+                column.append(value)
+    return columns
+
+
+def read_from_file_parallel(filename: str, workers: Optional[int] = None, columnar: bool = False,
+                            min_parallel_size: int = 1 << 20):
+    """
+    Read a large client file by parsing newline-aligned byte ranges of a memory map in a process pool.
+
+    The clients come back in file order. Files smaller than min_parallel_size are parsed in this process.
+    :param filename: name of file to get info from.
+    :param workers: number of worker processes, the number of CPUs by default.
+    :param columnar: return columns instead of client objects.
+    :param min_parallel_size: smallest file size in bytes worth starting worker processes for.
+    :return: list of clients, or a dictionary of column name to names, banks or array("q") of numbers.
+    """
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(filename)
+    if size == 0:
+        ranges = []
+    else:
+        with open(filename, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            ranges = _newline_aligned_ranges(mapped, workers * 4 if size >= min_parallel_size else 1)
+
+    if len(ranges) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_parse_range, [filename] * len(ranges), *zip(*ranges),
+                                      [columnar] * len(ranges)))
+    else:
+        parts = [_parse_range(filename, start, end, columnar) for start, end in ranges]
+
+    if not columnar:
+        return [client for part in parts for client in part]
+
+    names = ("name", "bank", "account_age", "starting_amount", "current_amount")
+    columns = {"name": [], "bank": [], "account_age": array("q"), "starting_amount": array("q"),
+               "current_amount": array("q")}
+    for part in parts:
+        for name, values in zip(names, part):
+            columns[name].extend(values)
+    return columns
 
-    return clients
+
+def track_earnings(clients) -> EarningsTracker:
+    """
+    Find the best and worst client of a stream in one pass and constant memory.
+
+    :param clients: any iterable of clients, e.g. iter_clients(filename).
+    :return: tracker holding the best and worst client.
+    """
+    tracker = EarningsTracker()
+    for client in clients:
+        tracker.add(client)
+    return tracker
+
+
+def track_earnings_by_bank(clients) -> dict:
+    """
+    Find the best and worst client of every bank in one pass.
+
+    :param clients: any iterable of clients, e.g. iter_clients(filename).
+    :return: dictionary of bank name to tracker holding that bank's best and worst client.
+    """
+    trackers = {}
+    for client in clients:
+        tracker = trackers.get(client.bank)
+        if tracker is None:
+            tracker = trackers[client.bank] = EarningsTracker()
+        tracker.add(client)
+    return trackers
+
+
+def stream_largest_earnings_per_day(clients) -> Optional[Client]:
+    """
+    Find the client that has earned the most money per day without keeping the clients in memory.
+
+    :param clients: any iterable of clients, e.g. iter_clients(filename).
+    :return: client with largest earnings.
+    """
+    return track_earnings(clients).best
+
+
+def stream_largest_loss_per_day(clients) -> Optional[Client]:
+    """
+    Find the client that has lost the most money per day without keeping the clients in memory.
+
+    :param clients: any iterable of clients, e.g. iter_clients(filename).
+    :return: client with largest loss.
+    """
+    return track_earnings(clients).worst
+
+
+class ClientIndex:
+    """
+    Clients of one file, grouped by bank.
+
+    Built in a single pass: besides the client list it keeps the clients of every bank and a running
+    best/worst tracker for every bank and for the whole file.
+    """
+
+    def __init__(self, clients):
+        """
+        ClientIndex constructor.
+
+        :param clients: any iterable of clients.
+        """
+        self.clients = []
+        self.by_bank = {}
+        self.tracker = EarningsTracker()
+        self.bank_trackers = {}
+        for client in clients:
+            self.clients.append(client)
+            bank_clients = self.by_bank.get(client.bank)
+            if bank_clients is None:
+                bank_clients = self.by_bank[client.bank] = []
+                self.bank_trackers[client.bank] = EarningsTracker()
+            bank_clients.append(client)
+            self.tracker.add(client)
+            self.bank_trackers[client.bank].add(client)
+
+
+class ClientRegistry:
+    """
+    Cache of parsed client files.
+
+    A file is parsed once and reused until its modification time or size changes,
+    so a report running several queries on the same file reads it only once.
+    Only the max_files most recently used files are kept. The cached Client objects are shared
+    by every query on the file, so callers must not modify them.
+    """
+
+    def __init__(self, max_files: int = 4):
+        """
+        ClientRegistry constructor.
+
+        :param max_files: number of parsed files to keep, the least recently used one is dropped first.
+        """
+        self.max_files = max_files
+        self._files = OrderedDict()
+
+    def index(self, filename: str) -> ClientIndex:
+        """
+        Return the index of the file, parsing it only if it is new or has changed.
+
+        :param filename: name of file to get info from.
+        :return: index of the file's clients.
+        """
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached is None or cached[0] != version:
+            cached = self._files[path] = (version, ClientIndex(iter_clients(path)))
+        self._files.move_to_end(path)
+        while len(self._files) > self.max_files:
+            self._files.popitem(last=False)
+        return cached[1]
+
+    def clients(self, filename: str) -> list:
+        """
+        Return the clients of the file, parsing it only if it is new or has changed.
+
+        The returned list is shared between callers and must not be modified.
+
+        :param filename: name of file to get info from.
+        :return: list of clients.
+        """
+        return self.index(filename).clients
+
+    def clear(self):
+        """Forget all parsed files."""
+        self._files.clear()
+
+
+registry = ClientRegistry()
 
 
 def filter_by_bank(filename: str, bank: str) -> list:
     """
     Find the clients of the bank.
 
+    The clients are shared with later calls on the same file through the module registry; do not modify them.
     :param filename: name of file to get info from.
     :param bank: to filter by.
     :return: filtered list of people.
     """
-    all_clients = read_from_file_into_list(filename)
-    return [c for c in all_clients if c.bank == bank]
+    return list(registry.index(filename).by_bank.get(bank, []))
 
 
 def largest_earnings_per_day(filename: str) -> Optional[Client]:
@@ -90,16 +501,11 @@ def largest_earnings_per_day(filename: str) -> Optional[Client]:
 
     If two people have earned the same amount of money per day, then return the one that has earned it in less time.
     If no-one has earned money (everyone has less or equal to wat they started with), then return None.
+    The client is shared with later calls on the same file through the module registry; do not modify it.
     :param filename: name of file to get info from.
     :return: client with largest earnings.
     """
-    clients = read_from_file_into_list(filename)
-    winners = [c for c in clients if c.current_amount > c.starting_amount]
-
-    if not winners:
-        return None
-
-    return max(winners, key=lambda c: (c.earnings_per_day(), -c.account_age))
+    return registry.index(filename).tracker.best
 
 
 def largest_loss_per_day(filename: str) -> Optional[Client]:
@@ -108,20 +514,30 @@ def largest_loss_per_day(filename: str) -> Optional[Client]:
 
     If two people have lost the same amount of money per day, then return the one that has lost it in less time.
     If everyone has earned money (everyone has more or equal to what they started with), then return None.
+    The client is shared with later calls on the same file through the module registry; do not modify it.
     :param filename: name of file to get info from.
     :return: client with largest loss.
     """
-    clients = read_from_file_into_list(filename)
-    losers = [c for c in clients if c.current_amount < c.starting_amount]
+    return registry.index(filename).tracker.worst
 
-    if not losers:
-        return None
 
-    return min(losers, key=lambda c: (c.earnings_per_day(), c.account_age))
+def best_and_worst_per_bank(filename: str) -> dict:
+    """
+    Find the client with the largest earnings and the one with the largest loss per day for every bank.
+
+    Uses the same rules as largest_earnings_per_day and largest_loss_per_day; either client can be None.
+    The clients are shared with later calls on the same file through the module registry; do not modify them.
+    :param filename: name of file to get info from.
+    :return: dictionary of bank name to (client with largest earnings, client with largest loss).
+    """
+    trackers = registry.index(filename).bank_trackers
+    return {bank: (tracker.best, tracker.worst) for bank, tracker in trackers.items()}
 
 
 if __name__ == '__main__':
     print(read_from_file_into_list("clients_info.txt"))  # -> [Ann, Mark, Josh, Jonah, Franz]
     print(filter_by_bank("clients_info.txt", "Sprint"))  # -> [Ann, Mark]
     print(largest_earnings_per_day("clients_info.txt"))  # -> Josh
-    print(largest_loss_per_day("clients_info.txt"))  # -> Franz
\ No newline at end of file
+    print(largest_loss_per_day("clients_info.txt"))  # -> Franz
+    print(stream_largest_earnings_per_day(iter_clients("clients_info.txt")))  # -> Josh
+    print(best_and_worst_per_bank("clients_info.txt"))  # -> {'Sprint': (Ann, None), 'Jarvis': (Josh, Jonah), ...}
\ No newline at end of file
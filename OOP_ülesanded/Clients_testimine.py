@@ -0,0 +1,176 @@
+import os
+import random
+
+import pytest
+from Clients import (Client, ClientIndex, ClientRegistry, ClientTable, best_and_worst_per_bank, filter_by_bank,
+                     largest_earnings_per_day, largest_loss_per_day, read_from_file_into_list, read_from_file_parallel,
+                     stream_largest_earnings_per_day, stream_largest_loss_per_day, track_earnings,
+                     track_earnings_by_bank)
+
+
+def write_clients(path, lines: list, newline: str = "\n", trailing_newline: bool = True) -> str:
+    """Write client lines to a file with the given line ending and return its name."""
+    text = newline.join(lines) + (newline if trailing_newline else "")
+    path.write_bytes(text.encode())
+    return str(path)
+
+
+def fields(clients: list) -> list:
+    """Return every client as a tuple of its fields."""
+    return [(c.name, c.bank, c.account_age, c.starting_amount, c.current_amount) for c in clients]
+
+
+def random_clients(seed: int, n: int = 400) -> list:
+    """Return clients with many tied earnings per day and some accounts that are 0 days old."""
+    rng = random.Random(seed)
+    return [Client(f"Client{i}", rng.choice(["Sprint", "Jarvis", "Pank"]), rng.randint(0, 4),
+                   rng.choice([100, 200]), rng.choice([0, 100, 200, 300])) for i in range(n)]
+
+
+def old_largest_earnings(clients: list):
+    """Pick the client with the largest earnings per day like the original largest_earnings_per_day."""
+    winners = [c for c in clients if c.current_amount > c.starting_amount]
+    return max(winners, key=lambda c: (c.earnings_per_day(), -c.account_age)) if winners else None
+
+
+def old_largest_loss(clients: list):
+    """Pick the client with the largest loss per day like the original largest_loss_per_day."""
+    losers = [c for c in clients if c.current_amount < c.starting_amount]
+    return min(losers, key=lambda c: (c.earnings_per_day(), c.account_age)) if losers else None
+
+
+LINES = [f"Client{i},Bank{i % 3},{i % 50 + 1},{i * 10},{i * 7 - 300}" for i in range(300)]
+EXPECTED = [(f"Client{i}", f"Bank{i % 3}", i % 50 + 1, i * 10, i * 7 - 300) for i in range(300)]
+
+@pytest.mark.timeout(10.0)
+def test_read_from_file_parallel_keeps_file_order(tmp_path):
+    """Check that clients parsed by several worker processes come back in file order."""
+    filename = write_clients(tmp_path / "clients.txt", LINES)
+    assert fields(read_from_file_parallel(filename, workers=3, min_parallel_size=1)) == EXPECTED
+    assert fields(read_from_file_parallel(filename, workers=1)) == fields(read_from_file_into_list(filename))
+
+    columns = read_from_file_parallel(filename, workers=3, columnar=True, min_parallel_size=1)
+    assert columns["name"] == [name for name, *_ in EXPECTED]
+    assert list(columns["current_amount"]) == [current for *_, current in EXPECTED]
+
+@pytest.mark.timeout(10.0)
+def test_read_from_file_parallel_crlf_lines(tmp_path):
+    """Make sure Windows line endings do not end up in the parsed fields."""
+    filename = write_clients(tmp_path / "clients.txt", LINES, newline="\r\n")
+    assert fields(read_from_file_parallel(filename, workers=3, min_parallel_size=1)) == EXPECTED
+
+    columns = read_from_file_parallel(filename, workers=3, columnar=True, min_parallel_size=1)
+    assert columns["bank"] == [bank for _, bank, *_ in EXPECTED]
+
+@pytest.mark.timeout(10.0)
+def test_read_from_file_parallel_without_trailing_newline(tmp_path):
+    """Check that the last client is read when the file does not end with a newline."""
+    filename = write_clients(tmp_path / "clients.txt", LINES, trailing_newline=False)
+    assert fields(read_from_file_parallel(filename, workers=3, min_parallel_size=1)) == EXPECTED
+
+    filename = write_clients(tmp_path / "one.txt", LINES[:1], trailing_newline=False)
+    assert fields(read_from_file_parallel(filename, workers=3, min_parallel_size=1)) == EXPECTED[:1]
+    assert read_from_file_parallel(write_clients(tmp_path / "empty.txt", [], trailing_newline=False)) == []
+
+@pytest.mark.timeout(1.0)
+def test_registry_reuses_parsed_file_until_it_changes(tmp_path):
+    """Check that a file is parsed once and parsed again only after its size or modification time changes."""
+    registry = ClientRegistry()
+    filename = write_clients(tmp_path / "clients.txt", LINES[:3])
+    first = registry.index(filename)
+    assert registry.index(filename) is first
+    assert registry.clients(filename) is first.clients
+
+    write_clients(tmp_path / "clients.txt", LINES[:4])
+    changed = registry.index(filename)
+    assert changed is not first and len(changed.clients) == 4
+
+    stat = os.stat(filename)
+    write_clients(tmp_path / "clients.txt", LINES[4:8])
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert fields(registry.clients(filename)) == EXPECTED[4:8]
+
+@pytest.mark.timeout(1.0)
+def test_registry_keeps_only_recent_files(tmp_path):
+    """Make sure the registry drops the least recently used file once it holds max_files files."""
+    registry = ClientRegistry(max_files=2)
+    names = [write_clients(tmp_path / f"clients{i}.txt", LINES[i:i + 2]) for i in range(3)]
+    first = registry.index(names[0])
+    second = registry.index(names[1])
+    assert registry.index(names[0]) is first
+
+    registry.index(names[2])
+    assert registry.index(names[0]) is first
+    assert registry.index(names[1]) is not second
+
+@pytest.mark.timeout(1.0)
+def test_earnings_trackers_match_max_and_min():
+    """Check that the one-pass trackers pick the same clients as max and min, overall and for every bank."""
+    for seed in range(20):
+        clients = random_clients(seed)
+        tracker = track_earnings(iter(clients))
+        assert tracker.best is old_largest_earnings(clients)
+        assert tracker.worst is old_largest_loss(clients)
+        assert stream_largest_earnings_per_day(c for c in clients) is tracker.best
+        assert stream_largest_loss_per_day(c for c in clients) is tracker.worst
+
+        trackers = track_earnings_by_bank(clients)
+        assert list(trackers) == list(dict.fromkeys(c.bank for c in clients))
+        for bank, bank_tracker in trackers.items():
+            bank_clients = [c for c in clients if c.bank == bank]
+            assert bank_tracker.best is old_largest_earnings(bank_clients)
+            assert bank_tracker.worst is old_largest_loss(bank_clients)
+
+    only_losses = [Client("A", "Sprint", 0, 100, 50), Client("B", "Sprint", 3, 100, 100)]
+    assert track_earnings(only_losses).best is None
+    assert track_earnings(only_losses).worst is only_losses[0]
+    assert track_earnings([]).worst is None
+
+@pytest.mark.timeout(1.0)
+def test_client_index_per_bank_results_match_max_and_min(tmp_path):
+    """Make sure the bank index and the per-bank best and worst clients match filtering and max/min per bank."""
+    clients = random_clients(3)
+    index = ClientIndex(clients)
+    assert index.clients == clients
+    for bank, bank_clients in index.by_bank.items():
+        assert bank_clients == [c for c in clients if c.bank == bank]
+        assert index.bank_trackers[bank].best is old_largest_earnings(bank_clients)
+        assert index.bank_trackers[bank].worst is old_largest_loss(bank_clients)
+
+    lines = [f"{c.name},{c.bank},{c.account_age},{c.starting_amount},{c.current_amount}" for c in clients]
+    filename = write_clients(tmp_path / "clients.txt", lines)
+    parsed = read_from_file_into_list(filename)
+    assert fields(filter_by_bank(filename, "Pank")) == fields([c for c in parsed if c.bank == "Pank"])
+    assert filter_by_bank(filename, "Nobody") == []
+    assert fields([largest_earnings_per_day(filename)]) == fields([old_largest_earnings(parsed)])
+    assert fields([largest_loss_per_day(filename)]) == fields([old_largest_loss(parsed)])
+
+    per_bank = best_and_worst_per_bank(filename)
+    assert list(per_bank) == list(dict.fromkeys(c.bank for c in parsed))
+    for bank, (best, worst) in per_bank.items():
+        bank_clients = [c for c in parsed if c.bank == bank]
+        assert fields([best, worst]) == fields([old_largest_earnings(bank_clients), old_largest_loss(bank_clients)])
+
+@pytest.mark.timeout(5.0)
+def test_client_table_matches_scalar_functions(tmp_path):
+    """Check that the vectorized table picks the same rows as the scalar functions, ties and 0-day accounts included."""
+    pytest.importorskip("numpy")
+    for seed in range(20):
+        clients = random_clients(seed, 200)
+        table = ClientTable.from_clients(clients)
+        best, worst = old_largest_earnings(clients), old_largest_loss(clients)
+        assert table.largest_earnings_index() == clients.index(best)
+        assert table.largest_loss_index() == clients.index(worst)
+        assert fields([table.largest_earnings_per_day(), table.largest_loss_per_day()]) == fields([best, worst])
+
+    zero_days = [Client("A", "Sprint", 0, 100, 500), Client("B", "Sprint", 2, 100, 100),
+                 Client("C", "Sprint", 0, 100, 50)]
+    table = ClientTable.from_clients(zero_days)
+    assert list(table.earnings_per_day()) == [0.0, 0.0, 0.0]
+    assert table.largest_earnings_index() == 0 and table.largest_loss_index() == 2
+    assert ClientTable.from_clients(zero_days[1:2]).largest_earnings_per_day() is None
+
+    lines = [f"{c.name},{c.bank},{c.account_age},{c.starting_amount},{c.current_amount}" for c in random_clients(1)]
+    filename = write_clients(tmp_path / "clients.txt", lines)
+    assert fields([ClientTable.from_file(filename, workers=2).largest_loss_per_day()]) == fields(
+        [old_largest_loss(read_from_file_into_list(filename))])
@@ -1,4 +1,15 @@
 """Students."""
+from bisect import bisect_left, bisect_right, insort
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
 
 
 class Student:
@@ -97,6 +108,295 @@ def sort_by_worst_grade(student_list: list) -> list:
     return sorted(succeeding, key=lambda student: (student.average_grade, student.name))
 
 
+class StudentRoster:
+    """
+    Students indexed by course and by grade.
+
+    Keeps a course -> students index and the set of courses of every student,
+    so course filters cost time proportional to the result instead of a scan over every student.
+    Failing students are kept apart and succeeding students are kept sorted by (grade, name) in both
+    directions, so rankings and grade ranges are read straight off the sorted lists.
+    """
+
+    def __init__(self, student_list: list = ()):
+        """
+        StudentRoster constructor.
+
+        :param student_list: students to start with
+        """
+        self.students = []
+        self._course_sets = []
+        self._by_course = {}
+        self._positions = {}
+        self._failing = set()
+        # The (grade, name, position) key each succeeding student was ranked under, None for failing students.
+        self._keys = []
+        # (grade, name, position) and (-grade, name, position) of succeeding students, with their grades.
+        self._worst_first = []
+        self._best_first = []
+        self._grades = []
+        for student in student_list:
+            self.add(student)
+
+    def add(self, student: Student):
+        """
+        Add a student to the roster.
+
+        The student's courses must not change afterwards, and grades change only through set_grade.
+
+        :param student: a Student object
+        :raises ValueError: if the student is already in the roster
+        """
+        if id(student) in self._positions:
+            raise ValueError(f"{student.name} is already in the roster")
+        position = len(self.students)
+        courses = set(student.courses)
+        self.students.append(student)
+        self._course_sets.append(courses)
+        self._positions[id(student)] = position
+        self._keys.append(None)
+        for course in courses:
+            self._by_course.setdefault(course, []).append(position)
+        self._rank(position)
+
+    def _rank(self, position: int):
+        """Put a student into the failing set or the sorted lists of succeeding students."""
+        student = self.students[position]
+        if is_failing(student):
+            self._failing.add(position)
+            return
+        key = (student.average_grade, student.name, position)
+        self._keys[position] = key
+        index = bisect_left(self._worst_first, key)
+        self._worst_first.insert(index, key)
+        self._grades.insert(index, student.average_grade)
+        insort(self._best_first, (-student.average_grade, student.name, position))
+
+    def _unrank(self, position: int):
+        """Take a student out of the failing set or the sorted lists of succeeding students."""
+        if position in self._failing:
+            self._failing.remove(position)
+            return
+        # Use the key the student was ranked under, the attributes may have been changed since.
+        grade, name, _ = key = self._keys[position]
+        self._keys[position] = None
+        index = bisect_left(self._worst_first, key)
+        del self._worst_first[index]
+        del self._grades[index]
+        del self._best_first[bisect_left(self._best_first, (-grade, name, position))]
+
+    def set_grade(self, student: Student, average_grade: float):
+        """
+        Change the average grade of a student in the roster.
+
+        :param student: a Student object in the roster
+        :param average_grade: the new average grade
+        """
+        position = self._positions[id(student)]
+        self._unrank(position)
+        student.average_grade = average_grade
+        self._rank(position)
+
+    def failing_students(self) -> list:
+        """
+        Return the students that are failing school, in roster order.
+
+        :return: list of failing students
+        """
+        return [self.students[position] for position in sorted(self._failing)]
+
+    def succeeding_students(self) -> list:
+        """
+        Return the students that are not failing school, in roster order.
+
+        :return: list of succeeding students
+        """
+        return [self.students[position] for position in sorted(key[2] for key in self._worst_first)]
+
+    def sort_by_best_grade(self, n: int = None) -> list:
+        """
+        Return succeeding students by average grade in descending order, alphabetically on equal grades.
+
+        :param n: return only the first n students
+        :return: sorted list of succeeding students
+        """
+        return [self.students[key[2]] for key in self._best_first[:n]]
+
+    def sort_by_worst_grade(self, n: int = None) -> list:
+        """
+        Return succeeding students by average grade in ascending order, alphabetically on equal grades.
+
+        :param n: return only the first n students
+        :return: sorted list of succeeding students
+        """
+        return [self.students[key[2]] for key in self._worst_first[:n]]
+
+    def students_with_grade_between(self, lowest: float, highest: float) -> list:
+        """
+        Return succeeding students whose average grade is from lowest to highest, in ascending order.
+
+        :param lowest: lowest average grade
+        :param highest: highest average grade
+        :return: sorted list of succeeding students
+        """
+        start = bisect_left(self._grades, lowest)
+        end = bisect_right(self._grades, highest)
+        return [self.students[key[2]] for key in self._worst_first[start:end]]
+
+    def filter_by_course(self, course: str) -> list:
+        """
+        Return the students taking a certain course, in roster order.
+
+        :param course: the title of the course
+        :return: a filtered list of students taking the course
+        """
+        return [self.students[position] for position in self._by_course.get(course, [])]
+
+    def filter_by_courses(self, courses: list, match_all: bool = True) -> list:
+        """
+        Return the students taking all (or any) of the given courses, in roster order.
+
+        :param courses: titles of the courses
+        :param match_all: if True students must take every course, otherwise at least one
+        :return: a filtered list of students
+        """
+        courses = set(courses)
+        postings = [self._by_course.get(course, []) for course in courses]
+        if not postings:
+            return []
+        if match_all:
+            # Walk the shortest posting list and check the others through the students' course sets.
+            shortest = min(postings, key=len)
+            positions = [p for p in shortest if courses <= self._course_sets[p]]
+        else:
+            positions = sorted(set().union(*postings))
+        return [self.students[position] for position in positions]
+
+
+class CourseMatrix:
+    """
+    Student x course incidence matrix for bulk course analytics.
+
+    Uses a scipy.sparse matrix when SciPy is installed and plain NumPy index arrays otherwise.
+    Course sizes, course co-enrollment counts and per-course average grades are computed for all courses at once.
+    Needs NumPy.
+    """
+
+    def __init__(self, student_list: list):
+        """
+        CourseMatrix constructor.
+
+        :param student_list: a list of Students
+        """
+        if np is None:
+            raise ImportError("CourseMatrix needs NumPy")
+        self.students = list(student_list)
+        self.courses = []
+        self._columns = {}
+        rows = []
+        columns = []
+        for row, student in enumerate(self.students):
+            for course in dict.fromkeys(student.courses):
+                column = self._columns.get(course)
+                if column is None:
+                    column = self._columns[course] = len(self.courses)
+                    self.courses.append(course)
+                rows.append(row)
+                columns.append(column)
+        self.rows = np.array(rows, dtype=np.int64)
+        self.columns = np.array(columns, dtype=np.int64)
+        self.grades = np.array([student.average_grade for student in self.students], dtype=np.float64)
+        self.matrix = None
+        self._co_enrollment = None
+        if sparse is not None:
+            self.matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (self.rows, self.columns)),
+                                            shape=(len(self.students), len(self.courses)))
+
+    def course_sizes(self) -> dict:
+        """
+        Return the number of students taking every course.
+
+        :return: dictionary of course title to number of students
+        """
+        sizes = np.bincount(self.columns, minlength=len(self.courses))
+        return {course: int(size) for course, size in zip(self.courses, sizes)}
+
+    def average_grades(self) -> dict:
+        """
+        Return the average grade of the students taking every course.
+
+        :return: dictionary of course title to average grade
+        """
+        sizes = np.bincount(self.columns, minlength=len(self.courses))
+        totals = np.bincount(self.columns, weights=self.grades[self.rows], minlength=len(self.courses))
+        return {course: float(total / size) for course, total, size in zip(self.courses, totals, sizes)}
+
+    def co_enrollment(self):
+        """
+        Return how many students take each pair of courses; the diagonal holds the course sizes.
+
+        Rows and columns follow self.courses. The matrix is computed once and then reused.
+
+        :return: course x course matrix, scipy.sparse with SciPy and a NumPy array without it
+        """
+        if self._co_enrollment is None:
+            if self.matrix is not None:
+                self._co_enrollment = (self.matrix.T @ self.matrix).tocsr()
+            else:
+                self._co_enrollment = self._co_enrollment_dense()
+        return self._co_enrollment
+
+    def _co_enrollment_dense(self):
+        """
+        Count course pairs without SciPy by joining every student's courses with themselves.
+
+        Incidences are stored grouped by student, so each one is repeated once per course of its student
+        and paired with that student's courses through offsets into the group.
+
+        :return: course x course NumPy array
+        """
+        count = len(self.courses)
+        group_sizes = np.bincount(self.rows, minlength=len(self.students))
+        group_starts = np.cumsum(group_sizes) - group_sizes
+        repeats = group_sizes[self.rows]
+        left = np.repeat(np.arange(len(self.rows)), repeats)
+        offsets = np.arange(len(left)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+        right = group_starts[self.rows[left]] + offsets
+        codes = self.columns[left] * count + self.columns[right]
+        return np.bincount(codes, minlength=count * count).reshape(count, count)
+
+    def co_enrollment_count(self, course_a: str, course_b: str) -> int:
+        """
+        Return how many students take both courses.
+
+        :param course_a: title of the first course
+        :param course_b: title of the second course
+        :return: number of students taking both
+        """
+        if course_a not in self._columns or course_b not in self._columns:
+            return 0
+        return int(self.co_enrollment()[self._columns[course_a], self._columns[course_b]])
+
+    def most_overlapping(self, n: int = 10) -> list:
+        """
+        Return the pairs of different courses with the most students in common.
+
+        Pairs with equal counts keep the order the courses were first seen in.
+
+        :param n: number of pairs to return
+        :return: list of ((course, course), number of common students), largest first
+        """
+        matrix = self.co_enrollment()
+        if self.matrix is not None:
+            upper = sparse.triu(matrix, k=1).tocoo()
+            first, second, counts = upper.row, upper.col, upper.data
+        else:
+            first, second = np.nonzero(np.triu(matrix, k=1))
+            counts = matrix[first, second]
+        order = np.lexsort((second, first, -counts))[:n]
+        return [((self.courses[first[i]], self.courses[second[i]]), int(counts[i])) for i in order]
+
+
 if __name__ == '__main__':
     student1 = Student("Ann", ["Programming", "Maths", "Lithology"], 3.2)
     student2 = Student("Josh", ["Maths", "English", "Politics"], 2.0)
@@ -110,3 +410,17 @@ if __name__ == '__main__':
     print(failing_students(students))  # -> [Bush]
     print(sort_by_best_grade(students))  # -> [Marcus, Ann, Josh]
     print(sort_by_worst_grade(students))  # -> [Josh, Ann, Marcus]
+
+    roster = StudentRoster(students)
+    print(roster.filter_by_course("Maths"))  # -> [Ann, Josh]
+    print(roster.filter_by_courses(["Maths", "Politics"]))  # -> [Josh]
+    print(roster.filter_by_courses(["Programming", "Politics"], match_all=False))  # -> [Ann, Josh, Bush]
+    print(roster.sort_by_best_grade(2))  # -> [Marcus, Ann]
+    roster.set_grade(student3, 2.5)
+    print(roster.sort_by_worst_grade())  # -> [Josh, Bush, Ann, Marcus]
+    print(roster.students_with_grade_between(2.0, 3.2))  # -> [Josh, Bush, Ann]
+
+    if np is not None:
+        courses = CourseMatrix(students)
+        print(courses.course_sizes()["Maths"])  # -> 2
+        print(courses.most_overlapping(1))  # -> [(('Programming', 'Maths'), 1)]
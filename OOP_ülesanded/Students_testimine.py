@@ -0,0 +1,125 @@
+import random
+
+import pytest
+import Students
+from Students import (CourseMatrix, Student, StudentRoster, failing_students, filter_by_course, sort_by_best_grade,
+                      sort_by_worst_grade, succeeding_students)
+
+
+def names_and_grades(students: list) -> list:
+    """Return the name and grade of every student, keeping the order."""
+    return [(s.name, s.average_grade) for s in students]
+
+@pytest.mark.timeout(2.0)
+def test_roster_orderings_follow_grade_changes():
+    """Check that the roster rankings match sorting the whole list again after every grade change."""
+    rng = random.Random(5)
+    students = [Student(rng.choice("ABCDE"), [], rng.randint(0, 10) / 2) for _ in range(300)]
+    roster = StudentRoster(students)
+
+    for step in range(1000):
+        roster.set_grade(rng.choice(students), rng.randint(0, 10) / 2)
+        if step % 50:
+            continue
+        assert roster.sort_by_best_grade() == sort_by_best_grade(students)
+        assert roster.sort_by_worst_grade() == sort_by_worst_grade(students)
+        assert roster.sort_by_best_grade(10) == sort_by_best_grade(students)[:10]
+        assert roster.failing_students() == failing_students(students)
+        assert roster.succeeding_students() == succeeding_students(students)
+        assert roster.students_with_grade_between(2.0, 3.5) == [
+            s for s in sort_by_worst_grade(students) if 2.0 <= s.average_grade <= 3.5]
+
+@pytest.mark.timeout(1.0)
+def test_set_grade_moves_student_between_failing_and_succeeding():
+    """Make sure a student who starts or stops failing moves between the failing list and the rankings."""
+    ann, bob, cid = Student("Ann", [], 3.0), Student("Bob", [], 0.5), Student("Cid", [], 3.0)
+    roster = StudentRoster([ann, bob, cid])
+    assert roster.failing_students() == [bob]
+
+    roster.set_grade(bob, 4.0)
+    roster.set_grade(ann, 0.0)
+    assert roster.failing_students() == [ann]
+    assert names_and_grades(roster.sort_by_best_grade()) == [("Bob", 4.0), ("Cid", 3.0)]
+    assert names_and_grades(roster.sort_by_worst_grade()) == [("Cid", 3.0), ("Bob", 4.0)]
+
+    roster.set_grade(cid, 4.0)
+    assert roster.sort_by_best_grade() == [bob, cid]
+    assert roster.students_with_grade_between(4.0, 4.0) == [bob, cid]
+
+@pytest.mark.timeout(1.0)
+def test_roster_course_filters():
+    """Check single and multi-course filters, AND and OR, against scanning every student's courses."""
+    rng = random.Random(7)
+    titles = ["Maths", "Politics", "Art", "Programming"]
+    students = [Student(f"S{i}", rng.sample(titles, rng.randint(0, 3)), 2.0) for i in range(200)]
+    roster = StudentRoster(students)
+
+    for course in titles + ["Unknown"]:
+        assert roster.filter_by_course(course) == filter_by_course(students, course)
+    for courses in (["Maths"], ["Maths", "Politics"], ["Art", "Maths", "Art"], ["Maths", "Unknown"]):
+        assert roster.filter_by_courses(courses) == [s for s in students if all(c in s.courses for c in courses)]
+        assert roster.filter_by_courses(c for c in courses) == roster.filter_by_courses(courses)
+        assert roster.filter_by_courses(courses, match_all=False) == [
+            s for s in students if any(c in s.courses for c in courses)]
+    assert roster.filter_by_courses(["Unknown"], match_all=False) == []
+    assert roster.filter_by_courses([]) == roster.filter_by_courses([], match_all=False) == []
+
+@pytest.mark.timeout(1.0)
+def test_set_grade_after_direct_grade_change_and_duplicate_students():
+    """Check that set_grade moves the right student after a direct grade change and that a student is added once."""
+    ann, bob, cid = Student("Ann", [], 2.0), Student("Bob", [], 3.0), Student("Cid", [], 4.0)
+    roster = StudentRoster([ann, bob, cid])
+    ann.average_grade = 3.5
+    roster.set_grade(ann, 2.5)
+    assert roster.sort_by_worst_grade() == [ann, bob, cid]
+    assert roster.sort_by_best_grade() == [cid, bob, ann]
+    assert roster.students_with_grade_between(2.0, 3.0) == [ann, bob]
+
+    with pytest.raises(ValueError):
+        roster.add(bob)
+    with pytest.raises(ValueError):
+        StudentRoster([ann, ann])
+    assert roster.students == [ann, bob, cid]
+
+def overlapping_pairs(students: list, courses: list) -> list:
+    """Count the common students of every pair of different courses by scanning every student."""
+    pairs = []
+    for i, first in enumerate(courses):
+        for second in courses[i + 1:]:
+            common = sum(first in s.courses and second in s.courses for s in students)
+            if common:
+                pairs.append(((first, second), common))
+    return sorted(pairs, key=lambda pair: -pair[1])
+
+
+def course_matrix_results(students: list) -> tuple:
+    """Build a CourseMatrix, check it against scanning every student and return its co-enrollment and rankings."""
+    matrix = CourseMatrix(students)
+    taking = {course: [s for s in students if course in s.courses] for course in matrix.courses}
+    expected_pairs = overlapping_pairs(students, matrix.courses)
+    assert matrix.course_sizes() == {course: len(group) for course, group in taking.items()}
+    assert matrix.average_grades() == pytest.approx(
+        {course: sum(s.average_grade for s in group) / len(group) for course, group in taking.items()})
+    assert matrix.most_overlapping(len(expected_pairs) + 5) == expected_pairs
+    assert matrix.most_overlapping(3) == expected_pairs[:3]
+    assert matrix.co_enrollment_count("Maths", "Art") == len([s for s in taking["Maths"] if "Art" in s.courses])
+    assert matrix.co_enrollment_count("Maths", "Unknown") == 0
+
+    co_enrollment = matrix.co_enrollment()
+    dense = co_enrollment.toarray() if matrix.matrix is not None else co_enrollment
+    return dense.tolist(), matrix.most_overlapping(), matrix.course_sizes(), matrix.average_grades()
+
+@pytest.mark.timeout(5.0)
+def test_course_matrix_sparse_and_numpy_paths_agree(monkeypatch):
+    """Make sure the SciPy matrix and the NumPy fallback give the same course analytics, both matching a scan."""
+    pytest.importorskip("numpy")
+    pytest.importorskip("scipy")
+    rng = random.Random(11)
+    titles = ["Maths", "Politics", "Art", "Programming", "English", "Chemistry"]
+    students = [Student(f"S{i}", rng.sample(titles, rng.randint(0, 4)), rng.randint(0, 10) / 2) for i in range(150)]
+    students.append(Student("Twice", ["Art", "Art"], 3.0))
+
+    with_scipy = course_matrix_results(students)
+    monkeypatch.setattr(Students, "sparse", None)
+    without_scipy = course_matrix_results(students)
+    assert without_scipy == with_scipy
@@ -1,9 +1,25 @@
 """Twitter."""
+import csv
+import heapq
+import json
+import math
+import os
+import time as clock
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class Tweet:
     """Tweet class."""
 
+    __slots__ = ("user", "content", "time", "retweets")
+
     def __init__(self, user: str, content: str, time: float, retweets: int):
         """
         Tweet constructor.
@@ -19,6 +35,58 @@ class Tweet:
         self.retweets = retweets
 
 
+def iter_tweets(filename: str, file_format: str = None, as_tuples: bool = False):
+    """
+    Read a tweet dump one record at a time.
+
+    JSONL dumps have one object per line and CSV dumps a header row, both with the fields user, content,
+    time and retweets. The result can be passed straight to the ranking and hashtag functions,
+    so the dump is never loaded into memory as a whole. Any other file_format raises ValueError right away.
+
+    :param filename: Path of the dump.
+    :param file_format: "jsonl" or "csv"; guessed from the file extension by default.
+    :param as_tuples: Yield (user, content, time, retweets) tuples instead of tweets.
+    :return: Generator of tweets or tuples.
+    """
+    file_format = file_format or ("csv" if filename.lower().endswith(".csv") else "jsonl")
+    if file_format not in ("jsonl", "csv"):
+        raise ValueError(f"Unknown tweet dump format {file_format!r}, expected 'jsonl' or 'csv'")
+    return _read_tweets(filename, file_format, as_tuples)
+
+
+def _read_tweets(filename: str, file_format: str, as_tuples: bool):
+    """
+    Yield the records of a tweet dump of a known format.
+
+    :param filename: Path of the dump.
+    :param file_format: "jsonl" or "csv".
+    :param as_tuples: Yield (user, content, time, retweets) tuples instead of tweets.
+    :return: Generator of tweets or tuples.
+    """
+    with open(filename, newline="", encoding="utf-8") as file:
+        if file_format == "csv":
+            records = csv.DictReader(file)
+        else:
+            records = (json.loads(line) for line in file if line.strip())
+        for record in records:
+            fields = (record["user"], record["content"], float(record["time"]), int(record["retweets"]))
+            yield fields if as_tuples else Tweet(*fields)
+
+
+def iter_tweet_chunks(filename: str, chunk_size: int = 10000, file_format: str = None, as_tuples: bool = False):
+    """
+    Read a tweet dump in lists of at most chunk_size records.
+
+    :param filename: Path of the dump.
+    :param chunk_size: Number of records in one chunk.
+    :param file_format: "jsonl" or "csv"; guessed from the file extension by default.
+    :param as_tuples: Yield lists of (user, content, time, retweets) tuples instead of tweets.
+    :return: Iterator of lists.
+    """
+    records = iter_tweets(filename, file_format, as_tuples)
+    return iter(lambda: list(islice(records, chunk_size)), [])
+
+
 def find_fastest_growing(tweets: list) -> Tweet:
     """
     Find the fastest growing tweet.
@@ -51,6 +119,20 @@ def sort_by_popularity(tweets: list) -> list:
     return sorted(tweets, key=lambda t: (-t.retweets, t.time))
 
 
+def top_k_by_popularity(tweets, k: int) -> list:
+    """
+    Find the k most popular tweets.
+
+    Uses the order of sort_by_popularity, but keeps only k tweets in memory, so it runs in O(n log k)
+    and works on any iterable, including a generator of tweets that does not fit in memory.
+
+    :param tweets: Input iterable of tweets.
+    :param k: Number of tweets to return.
+    :return: List of at most k tweets by popularity.
+    """
+    return heapq.nsmallest(k, tweets, key=lambda t: (-t.retweets, t.time))
+
+
 def filter_by_hashtag(tweets: list, hashtag: str) -> list:
     """
     Filter tweets by hashtag.
@@ -64,6 +146,18 @@ def filter_by_hashtag(tweets: list, hashtag: str) -> list:
     return [t for t in tweets if hashtag in t.content]
 
 
+def hashtags_of(content: str) -> set:
+    """
+    Find the hashtags of a tweet.
+
+    A hashtag is a whitespace separated word starting with '#'.
+
+    :param content: Content of the tweet.
+    :return: Set of hashtags in the content.
+    """
+    return set(word for word in content.split() if word.startswith('#'))
+
+
 def sort_hashtags_by_popularity(tweets: list) -> list:
     """
     Sort hashtags by popularity.
@@ -80,10 +174,7 @@ def sort_hashtags_by_popularity(tweets: list) -> list:
     """
     hashtags = {}
     for t in tweets:
-        words = t.content.split()
-        hashtag_in_tweet = set(word for word in words if word.startswith('#'))
-
-        for ht in hashtag_in_tweet:
+        for ht in hashtags_of(t.content):
             if ht not in hashtags:
                 hashtags[ht] = 0
             hashtags[ht] += t.retweets
@@ -91,6 +182,361 @@ def sort_hashtags_by_popularity(tweets: list) -> list:
     return sorted(hashtags.keys(), key=lambda h: (-hashtags[h], h))
 
 
+def _count_hashtags(shard) -> Counter:
+    """
+    Sum the retweets of every hashtag in one shard.
+
+    :param shard: Iterable of (content, retweets) pairs.
+    :return: Counter of hashtag to retweet sum.
+    """
+    counts = Counter()
+    for content, retweets in shard:
+        for ht in hashtags_of(content):
+            counts[ht] += retweets
+    return counts
+
+
+def sort_hashtags_by_popularity_parallel(tweets, workers: int = None, shard_size: int = 100000) -> list:
+    """
+    Sort hashtags by popularity, counting shards of tweets in a process pool.
+
+    Gives the same order as sort_hashtags_by_popularity. Tweets are read lazily, at most two shards
+    per worker are in flight at a time, so the input can be a generator over a corpus that does not fit in memory.
+
+    :param tweets: Input iterable of tweets.
+    :param workers: Number of worker processes, the number of CPUs by default.
+    :param shard_size: Number of tweets sent to a worker at once.
+    :return: List of hashtags by popularity.
+    """
+    workers = workers or os.cpu_count() or 1
+    pairs = ((t.content, t.retweets) for t in tweets)
+    totals = Counter()
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            shard = list(islice(pairs, shard_size))
+            if shard:
+                pending.append(executor.submit(_count_hashtags, shard))
+            if pending and (not shard or len(pending) >= 2 * workers):
+                # update keeps hashtags whose retweets sum to 0, unlike adding Counters.
+                totals.update(pending.popleft().result())
+            elif not shard:
+                break
+
+    return sorted(totals, key=lambda h: (-totals[h], h))
+
+
+def _count_hashtags_in_file(filename: str) -> Counter:
+    """
+    Sum the retweets of every hashtag in one tweet dump.
+
+    :param filename: Path of the dump.
+    :return: Counter of hashtag to retweet sum.
+    """
+    return _count_hashtags((content, retweets) for _, content, _, retweets in iter_tweets(filename, as_tuples=True))
+
+
+def sort_hashtags_by_popularity_in_files(filenames: list, workers: int = None) -> list:
+    """
+    Sort hashtags by popularity over several tweet dumps, counting each file in its own worker process.
+
+    :param filenames: Paths of JSONL or CSV dumps.
+    :param workers: Number of worker processes, the number of CPUs by default.
+    :return: List of hashtags by popularity.
+    """
+    totals = Counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        for counts in executor.map(_count_hashtags_in_file, filenames):
+            totals.update(counts)
+
+    return sorted(totals, key=lambda h: (-totals[h], h))
+
+
+class TweetCorpus:
+    """
+    Tweets tokenized once for hashtag queries.
+
+    Keeps a posting list of tweet positions and the retweet sum for every hashtag,
+    so filtering costs time proportional to the matches and ranking is a lookup plus a sort.
+    """
+
+    def __init__(self, tweets=()):
+        """
+        TweetCorpus constructor.
+
+        :param tweets: Tweets to start with.
+        """
+        self.tweets = []
+        self._postings = {}
+        self._popularity = {}
+        for tweet in tweets:
+            self.add(tweet)
+
+    def add(self, tweet: Tweet):
+        """
+        Add a tweet to the corpus.
+
+        The tweet's content and retweets must not change afterwards.
+
+        :param tweet: Tweet to add.
+        """
+        position = len(self.tweets)
+        self.tweets.append(tweet)
+        for ht in hashtags_of(tweet.content):
+            self._postings.setdefault(ht, []).append(position)
+            self._popularity[ht] = self._popularity.get(ht, 0) + tweet.retweets
+
+    def filter_by_hashtag(self, hashtag: str, substring: bool = False) -> list:
+        """
+        Filter tweets by hashtag.
+
+        By default only tweets having the hashtag as a whole word match.
+        With substring=True every tweet whose content contains the text matches, like filter_by_hashtag does.
+
+        :param hashtag: Hashtag to filter by.
+        :param substring: Use the substring test of filter_by_hashtag.
+        :return: Filtered list of tweets in the order they were added.
+        """
+        if substring:
+            return filter_by_hashtag(self.tweets, hashtag)
+        return [self.tweets[position] for position in self._postings.get(hashtag, [])]
+
+    def hashtag_popularity(self, hashtag: str) -> int:
+        """
+        Popularity of a hashtag.
+
+        :param hashtag: Hashtag to look up.
+        :return: Sum of the retweets of the tweets having the hashtag.
+        """
+        return self._popularity.get(hashtag, 0)
+
+    def sort_hashtags_by_popularity(self) -> list:
+        """
+        Sort hashtags by popularity with the rules of sort_hashtags_by_popularity.
+
+        :return: List of hashtags by popularity.
+        """
+        return sorted(self._popularity, key=lambda h: (-self._popularity[h], h))
+
+
+class TrendingHashtags:
+    """
+    Hashtag popularity over a sliding time window of a live tweet stream.
+
+    Popularity is scored like in sort_hashtags_by_popularity. Retweets are summed per hashtag into time
+    buckets, and buckets that fall out of the window are subtracted from the running totals, so the
+    ranking never has to be recomputed from the whole history. Every change of a total pushes the new
+    score onto a heap; outdated heap items are skipped when they come up. Use one engine per window,
+    e.g. an hour and a day.
+    """
+
+    def __init__(self, window: float = 3600, bucket: float = 60):
+        """
+        TrendingHashtags constructor.
+
+        :param window: Length of the window in seconds.
+        :param bucket: Length of one time bucket in seconds; the window moves in steps of this size.
+        """
+        self.window = window
+        self.bucket = bucket
+        self._bucket_count = math.ceil(window / bucket)
+        self._buckets = deque()
+        self._totals = {}
+        self._newest = None
+        self._heap = []
+
+    def add(self, tweet: Tweet, timestamp: float = None):
+        """
+        Take a tweet into account.
+
+        Tweets older than the window are ignored.
+
+        :param tweet: Tweet to add.
+        :param timestamp: Time the tweet arrived in seconds, the current time by default.
+        """
+        timestamp = clock.time() if timestamp is None else timestamp
+        number = int(timestamp // self.bucket)
+        if self._newest is None or number > self._newest:
+            self._newest = number
+            self._expire()
+        if number <= self._newest - self._bucket_count:
+            return
+
+        counts = None
+        for bucket_number, bucket_counts in reversed(self._buckets):
+            if bucket_number == number:
+                counts = bucket_counts
+                break
+            if bucket_number < number:
+                break
+        if counts is None:
+            counts = {}
+            self._buckets.append((number, counts))
+            if len(self._buckets) > 1 and self._buckets[-2][0] > number:
+                self._buckets = deque(sorted(self._buckets, key=lambda b: b[0]))
+
+        for ht in hashtags_of(tweet.content):
+            for table in (counts, self._totals):
+                score = table.setdefault(ht, [0, 0])
+                score[0] += tweet.retweets
+                score[1] += 1
+            self._push(ht)
+
+    def _expire(self):
+        """Drop buckets that have fallen out of the window and subtract them from the totals."""
+        oldest = self._newest - self._bucket_count + 1
+        while self._buckets and self._buckets[0][0] < oldest:
+            _, counts = self._buckets.popleft()
+            for ht, (retweets, tweets) in counts.items():
+                score = self._totals[ht]
+                if score[1] == tweets:
+                    del self._totals[ht]
+                else:
+                    score[0] -= retweets
+                    score[1] -= tweets
+                    self._push(ht)
+
+    def _push(self, ht: str):
+        """Push the current score of a hashtag onto the heap, rebuilding the heap when it is mostly outdated."""
+        if len(self._heap) > 2 * len(self._totals) + 1024:
+            self._heap = [(-score[0], h) for h, score in self._totals.items()]
+            heapq.heapify(self._heap)
+        else:
+            heapq.heappush(self._heap, (-self._totals[ht][0], ht))
+
+    def top(self, n: int = 10, now: float = None) -> list:
+        """
+        Most popular hashtags of the window.
+
+        :param n: Number of hashtags to return.
+        :param now: Current time in seconds; by default the window ends at the newest tweet.
+        :return: List of at most n hashtags by popularity.
+        """
+        if now is not None and (self._newest is None or now // self.bucket > self._newest):
+            self._newest = int(now // self.bucket)
+            self._expire()
+        result = []
+        current = []
+        while self._heap and len(result) < n:
+            item = heapq.heappop(self._heap)
+            score = self._totals.get(item[1])
+            if score is None or -score[0] != item[0] or (current and current[-1] == item):
+                continue
+            result.append(item[1])
+            current.append(item)
+        for item in current:
+            heapq.heappush(self._heap, item)
+        return result
+
+
+class TweetTable:
+    """
+    Retweets and ages of many tweets as NumPy arrays for growth rankings.
+
+    Growth is "retweets/time" like in find_fastest_growing. A tweet with time 0 has no defined growth,
+    so every query takes a zero_age policy: "skip" leaves such tweets out, "inf" ranks them above every
+    other tweet (or at 0 when they have no retweets) and "error" raises ZeroDivisionError like find_fastest_growing.
+    Ties go to the tweet that comes first, like max does. Needs NumPy.
+    """
+
+    def __init__(self, retweets, times, tweets: list = None):
+        """
+        TweetTable constructor.
+
+        :param retweets: Amounts of retweets.
+        :param times: Ages of the tweets.
+        :param tweets: Tweets of the rows, needed only to get tweets instead of row numbers back.
+        """
+        if np is None:
+            raise ImportError("TweetTable needs NumPy")
+        self.retweets = np.asarray(retweets, dtype=np.float64)
+        self.times = np.asarray(times, dtype=np.float64)
+        self.tweets = tweets
+
+    @classmethod
+    def from_tweets(cls, tweets):
+        """
+        Make a table from tweets.
+
+        :param tweets: Input iterable of tweets.
+        :return: Table of the tweets.
+        """
+        tweets = list(tweets)
+        return cls([t.retweets for t in tweets], [t.time for t in tweets], tweets)
+
+    def growth_rates(self, zero_age: str = "skip"):
+        """
+        Growth of every tweet.
+
+        :param zero_age: Policy for tweets with time 0: "skip", "inf" or "error".
+        :return: Float array of retweets/time; NaN for skipped tweets.
+        """
+        if zero_age not in ("skip", "inf", "error"):
+            raise ValueError(f"Unknown zero_age policy: {zero_age}")
+        zero = self.times == 0
+        if zero_age == "error" and zero.any():
+            raise ZeroDivisionError("Tweet with time 0 has no growth rate")
+        rates = np.divide(self.retweets, self.times, out=np.full(len(self.times), np.nan), where=~zero)
+        if zero_age == "inf":
+            rates[zero] = np.where(self.retweets[zero] > 0, np.inf, 0.0)
+        return rates
+
+    def fastest_growing_index(self, zero_age: str = "skip"):
+        """
+        Row of the fastest growing tweet.
+
+        :param zero_age: Policy for tweets with time 0: "skip", "inf" or "error".
+        :return: Row number or None if no tweet can be ranked.
+        """
+        rates = self.growth_rates(zero_age)
+        rows = np.flatnonzero(~np.isnan(rates))
+        if not len(rows):
+            return None
+        return int(rows[rates[rows].argmax()])
+
+    def top_k_growth_indices(self, k: int, zero_age: str = "skip"):
+        """
+        Rows of the k fastest growing tweets, fastest first.
+
+        :param k: Number of rows to return.
+        :param zero_age: Policy for tweets with time 0: "skip", "inf" or "error".
+        :return: Integer array of at most k row numbers.
+        """
+        rates = self.growth_rates(zero_age)
+        rows = np.flatnonzero(~np.isnan(rates))
+        values = rates[rows]
+        if 0 < k < len(rows):
+            # Keep everything above the k-th best rate and the earliest rows equal to it.
+            threshold = np.partition(values, len(values) - k)[len(values) - k]
+            above = np.flatnonzero(values > threshold)
+            equal = np.flatnonzero(values == threshold)[:k - len(above)]
+            chosen = np.concatenate([above, equal])
+        else:
+            chosen = np.arange(len(rows) if k > 0 else 0)
+        order = np.lexsort((chosen, -values[chosen]))
+        return rows[chosen[order]]
+
+    def fastest_growing(self, zero_age: str = "skip"):
+        """
+        Find the fastest growing tweet.
+
+        :param zero_age: Policy for tweets with time 0: "skip", "inf" or "error".
+        :return: Fastest growing tweet or None if no tweet can be ranked.
+        """
+        row = self.fastest_growing_index(zero_age)
+        return None if row is None else self.tweets[row]
+
+    def top_k_growth(self, k: int, zero_age: str = "skip") -> list:
+        """
+        Find the k fastest growing tweets.
+
+        :param k: Number of tweets to return.
+        :param zero_age: Policy for tweets with time 0: "skip", "inf" or "error".
+        :return: List of at most k tweets, fastest first.
+        """
+        return [self.tweets[row] for row in self.top_k_growth_indices(k, zero_age)]
+
+
 if __name__ == '__main__':
     tweet1 = Tweet("@realDonaldTrump", "Despite the negative press covfefe #bigsmart", 1249, 54303)
     tweet2 = Tweet("@elonmusk", "Technically, alcohol is a solution #bigsmart", 366.4, 166500)
@@ -98,15 +544,28 @@ if __name__ == '__main__':
     tweets = [tweet1, tweet2, tweet3]
 
     print(find_fastest_growing(tweets).user)  # -> "@elonmusk"
+    if np is not None:
+        print(TweetTable.from_tweets(tweets).fastest_growing().user)  # -> "@elonmusk"
 
     filtered_by_popularity = sort_by_popularity(tweets)
     print(filtered_by_popularity[0].user)  # -> "@CIA"
     print(filtered_by_popularity[1].user)  # -> "@elonmusk"
     print(filtered_by_popularity[2].user)  # -> "@realDonaldTrump"
 
+    print(top_k_by_popularity(iter(tweets), 1)[0].user)  # -> "@CIA"
+
     filtered_by_hashtag = filter_by_hashtag(tweets, "#bigsmart")
     print(filtered_by_hashtag[0].user)  # -> "@realDonaldTrump"
     print(filtered_by_hashtag[1].user)  # -> "@elonMusk"
 
     sorted_hashtags = sort_hashtags_by_popularity(tweets)
     print(sorted_hashtags[0])  # -> "#heart"
+
+    corpus = TweetCorpus(tweets)
+    print(corpus.filter_by_hashtag("#bigsmart")[1].user)  # -> "@elonmusk"
+    print(corpus.sort_hashtags_by_popularity())  # -> ['#heart', '#bigsmart']
+
+    trending = TrendingHashtags(window=3600)
+    for second, tweet in enumerate(tweets):
+        trending.add(tweet, second)
+    print(trending.top(1))  # -> ['#heart']
@@ -0,0 +1,194 @@
+import csv
+import json
+import random
+
+import pytest
+from Twitter import (Tweet, TrendingHashtags, TweetCorpus, TweetTable, filter_by_hashtag, find_fastest_growing,
+                     iter_tweet_chunks, iter_tweets, sort_by_popularity,
+                     sort_hashtags_by_popularity, sort_hashtags_by_popularity_in_files,
+                     sort_hashtags_by_popularity_parallel, top_k_by_popularity)
+
+TAGS = ["#a", "#B", "#b", "#python", "#Python", "#news", "#x"]
+
+
+def random_tweet(rng: random.Random) -> Tweet:
+    """Return a tweet with up to three random hashtags and a random number of retweets."""
+    words = rng.sample(TAGS, rng.randint(0, 3)) + ["text"]
+    return Tweet("user", " ".join(words), 1.0, rng.randint(0, 20))
+
+
+def write_jsonl(path, tweets: list) -> str:
+    """Write tweets as a JSONL dump and return its name."""
+    with open(path, "w", encoding="utf-8") as file:
+        for t in tweets:
+            record = {"user": t.user, "content": t.content, "time": t.time, "retweets": t.retweets}
+            file.write(json.dumps(record) + "\n")
+    return str(path)
+
+
+def expected_top(stream: list, newest: float, window: float, bucket: float, n: int) -> list:
+    """Rank the hashtags of the tweets whose bucket is still inside the window ending at newest."""
+    newest_bucket = newest // bucket
+    inside = [tweet for tweet, timestamp in stream if timestamp // bucket > newest_bucket - window // bucket]
+    return sort_hashtags_by_popularity(inside)[:n]
+
+@pytest.mark.timeout(5.0)
+def test_trending_hashtags_match_full_ranking_after_expiry():
+    """Check that the sliding window ranking matches a full ranking of the tweets still in the window."""
+    rng = random.Random(3)
+    engine = TrendingHashtags(window=100, bucket=10)
+    stream = []
+    timestamp = 0.0
+    newest = 0.0
+    for step in range(5000):
+        # Mostly moving forward, sometimes a late tweet from a few buckets back.
+        timestamp += rng.choice([0.0, 0.5, 1.0, 3.0])
+        arrival = timestamp - rng.choice([0.0, 0.0, 0.0, 25.0])
+        tweet = random_tweet(rng)
+        engine.add(tweet, arrival)
+        stream.append((tweet, arrival))
+        newest = max(newest, arrival)
+
+        if step % 100 == 0:
+            n = rng.randint(1, len(TAGS))
+            assert engine.top(n) == expected_top(stream, newest, 100, 10, n)
+
+@pytest.mark.timeout(5.0)
+def test_trending_hashtags_expire_when_time_moves_on():
+    """Make sure top with a later current time drops buckets that left the window, up to an empty ranking."""
+    engine = TrendingHashtags(window=60, bucket=10)
+    stream = [(Tweet("a", "#old #both", 1.0, 50), 5.0), (Tweet("b", "#both #new", 1.0, 10), 45.0),
+              (Tweet("c", "#new", 1.0, 1), 55.0)]
+    for tweet, timestamp in stream:
+        engine.add(tweet, timestamp)
+
+    assert engine.top(5) == sort_hashtags_by_popularity([tweet for tweet, _ in stream]) == ["#both", "#old", "#new"]
+    assert engine.top(5, now=70.0) == expected_top(stream, 70.0, 60, 10, 5) == ["#new", "#both"]
+    assert engine.top(5, now=105.0) == ["#new"]
+    assert engine.top(5, now=500.0) == []
+
+@pytest.mark.timeout(1.0)
+def test_tweet_corpus_filters_whole_hashtags_unless_asked_for_substrings():
+    """Check that the corpus matches whole hashtags by default and falls back to the substring test on request."""
+    tweets = [Tweet("a", "x#a", 1.0, 1), Tweet("b", "#ab text", 2.0, 2), Tweet("c", "#a", 3.0, 3),
+              Tweet("d", "#a #A #a", 4.0, 4), Tweet("e", "no tags", 5.0, 5)]
+    corpus = TweetCorpus(tweets)
+    assert corpus.filter_by_hashtag("#a") == [tweets[2], tweets[3]]
+    assert corpus.filter_by_hashtag("#a", substring=True) == filter_by_hashtag(tweets, "#a") == tweets[:4]
+    assert corpus.filter_by_hashtag("#ab") == [tweets[1]]
+    assert corpus.filter_by_hashtag("#missing") == []
+    assert corpus.hashtag_popularity("#a") == 7
+    assert corpus.hashtag_popularity("#missing") == 0
+
+@pytest.mark.timeout(1.0)
+def test_tweet_corpus_ranking_matches_sort_hashtags_by_popularity():
+    """Make sure the corpus ranks hashtags like sort_hashtags_by_popularity, also after more tweets are added."""
+    rng = random.Random(8)
+    tweets = [random_tweet(rng) for _ in range(500)]
+    corpus = TweetCorpus(tweets[:300])
+    assert corpus.sort_hashtags_by_popularity() == sort_hashtags_by_popularity(tweets[:300])
+    for tweet in tweets[300:]:
+        corpus.add(tweet)
+    assert corpus.sort_hashtags_by_popularity() == sort_hashtags_by_popularity(tweets)
+    for tag in TAGS:
+        assert corpus.filter_by_hashtag(tag) == [t for t in tweets if tag in t.content.split()]
+
+@pytest.mark.timeout(1.0)
+def test_top_k_by_popularity_matches_full_sort():
+    """Check that the top k tweets equal the first k of sort_by_popularity, with tied retweets and times."""
+    rng = random.Random(2)
+    tweets = [Tweet(f"user{i}", "text", rng.randint(1, 5) * 1.0, rng.randint(0, 5)) for i in range(300)]
+    for k in (0, 1, 7, 299, 300, 1000):
+        assert top_k_by_popularity(tweets, k) == sort_by_popularity(tweets)[:k]
+    assert top_k_by_popularity((t for t in tweets), 25) == sort_by_popularity(tweets)[:25]
+    assert top_k_by_popularity(iter([]), 3) == []
+
+@pytest.mark.timeout(10.0)
+def test_parallel_hashtag_popularity_matches_sort_hashtags_by_popularity(tmp_path):
+    """Check that merged shard and file counts keep the order, the case tie-break and zero-retweet hashtags."""
+    rng = random.Random(4)
+    tweets = [random_tweet(rng) for _ in range(200)] + [Tweet("z", "#Tie #tie #zero", 1.0, 0),
+                                                        Tweet("z", "#Tie #tie", 1.0, 7)]
+    expected = sort_hashtags_by_popularity(tweets)
+    assert "#zero" in expected and expected.index("#Tie") + 1 == expected.index("#tie")
+
+    assert sort_hashtags_by_popularity_parallel(tweets, workers=2, shard_size=7) == expected
+    assert sort_hashtags_by_popularity_parallel(iter(tweets), workers=2, shard_size=1000) == expected
+    assert sort_hashtags_by_popularity_parallel([], workers=2) == []
+
+    filenames = [write_jsonl(tmp_path / f"tweets{i}.jsonl", tweets[i::3]) for i in range(3)]
+    assert sort_hashtags_by_popularity_in_files(filenames, workers=2) == expected
+
+@pytest.mark.timeout(1.0)
+def test_tweet_loaders_read_jsonl_and_csv_dumps(tmp_path):
+    """Check that JSONL and CSV dumps load the same tweets, as objects, tuples and chunks, and that bad formats fail."""
+    rng = random.Random(6)
+    tweets = [Tweet(f"user{i}", f"hello, \"world\" {t.content}", i / 4, t.retweets)
+              for i, t in enumerate(random_tweet(rng) for _ in range(25))]
+    expected = [(t.user, t.content, t.time, t.retweets) for t in tweets]
+    jsonl = write_jsonl(tmp_path / "tweets.jsonl", tweets)
+    with open(tmp_path / "tweets.csv", "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["user", "content", "time", "retweets"])
+        writer.writerows(expected)
+
+    for filename in (jsonl, str(tmp_path / "tweets.csv")):
+        loaded = list(iter_tweets(filename))
+        assert all(isinstance(t, Tweet) for t in loaded)
+        assert [(t.user, t.content, t.time, t.retweets) for t in loaded] == expected
+        assert list(iter_tweets(filename, as_tuples=True)) == expected
+        chunks = list(iter_tweet_chunks(filename, chunk_size=10, as_tuples=True))
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert [record for chunk in chunks for record in chunk] == expected
+        assert sort_hashtags_by_popularity(iter_tweets(filename)) == sort_hashtags_by_popularity(tweets)
+
+    assert list(iter_tweets(jsonl, file_format="jsonl")) != []
+    with pytest.raises(ValueError):
+        iter_tweets(jsonl, file_format="tsv")
+    with pytest.raises(ValueError):
+        iter_tweet_chunks(jsonl, file_format="csb")
+
+def sorted_growth_rows(tweets: list, zero_age: str) -> list:
+    """Rank rows by growth with a full sort, the first row winning ties."""
+    rates = {}
+    for row, t in enumerate(tweets):
+        if t.time:
+            rates[row] = t.retweets / t.time
+        elif zero_age == "inf":
+            rates[row] = float("inf") if t.retweets > 0 else 0.0
+    return sorted(rates, key=lambda row: (-rates[row], row))
+
+@pytest.mark.timeout(2.0)
+def test_tweet_table_growth_rankings_match_full_sort():
+    """Check the vectorized growth rankings, partition ties and k bounds included, against a full sort."""
+    pytest.importorskip("numpy")
+    rng = random.Random(9)
+    for _ in range(30):
+        tweets = [Tweet("u", "t", rng.choice([0, 1, 2, 4]), rng.randint(0, 4)) for _ in range(rng.randint(1, 60))]
+        table = TweetTable.from_tweets(tweets)
+        for zero_age in ("skip", "inf"):
+            expected = sorted_growth_rows(tweets, zero_age)
+            for k in (-1, 0, 1, 3, len(tweets) - 1, len(tweets), len(tweets) + 5):
+                assert list(table.top_k_growth_indices(k, zero_age)) == expected[:max(k, 0)]
+            assert table.fastest_growing_index(zero_age) == (expected[0] if expected else None)
+            assert table.top_k_growth(3, zero_age) == [tweets[row] for row in expected[:3]]
+
+    tweets = [Tweet("u", "t", rng.randint(1, 5), rng.randint(0, 9)) for _ in range(50)]
+    assert TweetTable.from_tweets(tweets).fastest_growing(zero_age="error") is find_fastest_growing(tweets)
+
+@pytest.mark.timeout(1.0)
+def test_tweet_table_zero_age_policies():
+    """Make sure tweets with time 0 are skipped, ranked first or rejected according to the policy."""
+    pytest.importorskip("numpy")
+    tweets = [Tweet("a", "t", 2.0, 10), Tweet("b", "t", 0.0, 1), Tweet("c", "t", 0.0, 0), Tweet("d", "t", 1.0, 3)]
+    table = TweetTable.from_tweets(tweets)
+    assert table.top_k_growth(4, zero_age="skip") == [tweets[0], tweets[3]]
+    assert table.top_k_growth(4, zero_age="inf") == [tweets[1], tweets[0], tweets[3], tweets[2]]
+    assert table.fastest_growing(zero_age="inf") is tweets[1]
+    with pytest.raises(ZeroDivisionError):
+        find_fastest_growing(tweets)
+    with pytest.raises(ZeroDivisionError):
+        table.fastest_growing(zero_age="error")
+    with pytest.raises(ValueError):
+        table.growth_rates(zero_age="ignore")
+    assert TweetTable.from_tweets(tweets[1:3]).fastest_growing() is None